@@ -0,0 +1,82 @@
+# Amenity Service for TourismHub
+# This module writes and queries the normalized amenity tables so amenity filters
+# become indexed joins instead of LIKE scans over JSON text
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+
+from models import db, Amenity, Hotel, RoomType, Vehicle, hotel_amenity, room_type_amenity, vehicle_feature
+
+# Association table and owner column for every model that carries amenities
+ASSOCIATIONS = {
+    Hotel: (hotel_amenity, 'hotel_id'),
+    RoomType: (room_type_amenity, 'room_type_id'),
+    Vehicle: (vehicle_feature, 'vehicle_id')
+}
+
+
+def clean_names(names: Iterable[str]) -> List[str]:
+    """Strip, drop empty and de-duplicate amenity names, keeping their order"""
+    cleaned = []
+    for name in names or []:
+        name = (name or '').strip()
+        if name and name not in cleaned:
+            cleaned.append(name)
+    return cleaned
+
+
+def get_or_create_amenities(names: Iterable[str]) -> List[Amenity]:
+    """Amenity rows for the given names, creating the missing ones in one pass"""
+    names = clean_names(names)
+    if not names:
+        return []
+    found = {amenity.name: amenity for amenity in Amenity.query.filter(Amenity.name.in_(names)).all()}
+    for name in names:
+        if name not in found:
+            found[name] = Amenity(name=name)
+            db.session.add(found[name])
+    return [found[name] for name in names]
+
+
+def set_amenities(item, names: Iterable[str]):
+    """Store amenities on a Hotel/RoomType (or features on a Vehicle).
+
+    The JSON column is kept in step for code that still reads it.
+    """
+    names = clean_names(names)
+    amenities = get_or_create_amenities(names)
+    if isinstance(item, Vehicle):
+        item.features = json.dumps(names)
+        item.feature_items = amenities
+    else:
+        item.amenities = json.dumps(names)
+        item.amenity_items = amenities
+
+
+def filter_by_amenities(query, model, names: Iterable[str]):
+    """Restrict a Hotel/RoomType/Vehicle query to rows having every given amenity"""
+    names = clean_names(names)
+    if not names:
+        return query
+    table, owner_column = ASSOCIATIONS[model]
+    owner = table.c[owner_column]
+    matching = (
+        db.session.query(owner)
+        .join(Amenity, Amenity.id == table.c.amenity_id)
+        .filter(Amenity.name.in_(names))
+        .group_by(owner)
+        .having(func.count(table.c.amenity_id) == len(names))
+    )
+    return query.filter(model.id.in_(matching))
+
+
+def amenity_counts(model, ids: Optional[Iterable[int]] = None) -> Dict[str, int]:
+    """Number of owners carrying each amenity, computed with GROUP BY"""
+    table, owner_column = ASSOCIATIONS[model]
+    owner = table.c[owner_column]
+    query = db.session.query(Amenity.name, func.count(owner)).join(table, Amenity.id == table.c.amenity_id)
+    if ids is not None:
+        query = query.filter(owner.in_(list(ids)))
+    return dict(query.group_by(Amenity.name).order_by(Amenity.name).all())
@@ -1,19 +1,20 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, Response, stream_with_context, send_file, abort
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from flask_cors import CORS
 # Custom translation system
 from werkzeug.utils import secure_filename
 # Note: Using plaintext passwords per request (no hashing)
 from datetime import datetime, date, timedelta
+import hmac
 import json
 import os
 import random
 import string
 import time
-import asyncio
-import base64
 import math
+import re
 from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
 from io import BytesIO
 from deep_translator import GoogleTranslator
 import edge_tts
@@ -22,14 +23,34 @@ from geopy.geocoders import Nominatim
 import requests
 from openrouteservice import convert
 import google.generativeai as genai
-from models import db, User, Hotel, Booking, Admin, RoomType, RoomAvailability, Review, Wishlist, VehicleRental, Vehicle, VehicleBooking, VehicleReview, Complaint
-from sqlalchemy import or_, and_
+from models import db, User, Hotel, Booking, Admin, RoomType, Review, Wishlist, VehicleRental, Vehicle, VehicleBooking, VehicleReview, Complaint, missing_indexes
+from inventory import (room_inventory, fleet_inventory, LIVE_BOOKING_STATUSES, lock_for_booking, reserve_room_nights,
+                       release_room_nights, room_type_free_rooms, room_type_nightly, room_type_calendar, vehicle_calendar)
+from room_calendar import create_calendar, resize_calendar
+from hotel_search import hotel_search_index
+from amenities import set_amenities, filter_by_amenities, amenity_counts
+from ratings import review_added, rating_histogram
+from pagination import MAX_PAGE_SIZE, page_size, keyset_page, id_page, stream_json_array
+from query_stats import query_stats
+import metrics
+from metrics import outbound_call
+from translation_cache import translation_cache
+from tts_cache import audio_cache, audio_key
+from speech_worker import speech_worker
+from dashboard_stats import (hotel_owner_summary, vehicle_owner_summary, vehicle_owner_bookings,
+                             platform_metrics, invalidate_platform_metrics)
+from sqlalchemy import or_, func
+from sqlalchemy.orm import joinedload, selectinload
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///tourism.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///tourism.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
+app.config['SLOW_QUERY_MS'] = 100  # Log SQL statements slower than this
+# /metrics is served to these client addresses, or to requests bearing METRICS_TOKEN
+app.config['METRICS_ALLOWED_IPS'] = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
 
 # Custom translation system
 app.config['LANGUAGES'] = {
@@ -277,6 +298,8 @@ LANG_CONFIG: Dict[str, Dict[str, str]] = {
 }
 
 db.init_app(app)
+query_stats.init_app(app)
+metrics.init_app(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -333,14 +356,49 @@ def get_voice(lang_key: str, override_voice: Optional[str] = None) -> str:
         raise ValueError(f"Unsupported language: {lang_key}")
     return cfg["voice"]
 
+# Edge TTS prosody used for every clip; part of the audio cache key
+TTS_RATE = "+0%"
+TTS_VOLUME = "+0%"
+
+# Longest wait for a clip, or between two streamed chunks, before giving up
+TTS_TIMEOUT_SECONDS = 60
+
+# Longest text /api/tts/stream will read aloud (characters, after whitespace is collapsed)
+MAX_TTS_STREAM_CHARS = 10000
+
+def translate_codes(text: str, source_code: str, target_code: str) -> str:
+    """Translate between translator language codes ("auto" detects the source), through the translation cache"""
+    if not text or not text.strip():
+        return ""
+    return translation_cache.get_or_translate(
+        text, source_code, target_code, lambda normalized_text: fetch_translation(normalized_text, source_code, target_code)
+    )
+
+def fetch_translation(text: str, source_code: str, target_code: str) -> str:
+    """Call the translator directly, bypassing the cache"""
+    with outbound_call('translation'):
+        return GoogleTranslator(source=source_code, target=target_code).translate(text)
+
+def translate_and_cache(text: str, source_code: str, target_code: str) -> str:
+    """Translate text already known to be a cache miss and store the result"""
+    translated = fetch_translation(text, source_code, target_code) or ''
+    if translated:
+        translation_cache.set(text, source_code, target_code, translated)
+    return translated
+
+# Bounded pool for translator calls fanned out by /api/translate/batch
+TRANSLATION_WORKERS = 8
+MAX_BATCH_TEXTS = 100
+MAX_BATCH_TARGETS = 10
+# Longest a batch request waits for all of its translations together
+BATCH_TIMEOUT_SECONDS = 30
+translation_executor = ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS, thread_name_prefix='translation')
+
 def translate_text(text: str, source_lang_key: str, target_lang_key: str) -> str:
     """Translate text from source language to target language"""
     if not text:
         return ""
-    source_code = get_lang_code(source_lang_key)
-    target_code = get_lang_code(target_lang_key)
-    translated = GoogleTranslator(source=source_code, target=target_code).translate(text)
-    return translated or ""
+    return translate_codes(text, get_lang_code(source_lang_key), get_lang_code(target_lang_key))
 
 async def synthesize_speech_async(text: str, voice: str, rate: str = "+0%", volume: str = "+0%") -> bytes:
     """Synthesize speech asynchronously using Edge TTS"""
@@ -351,19 +409,94 @@ async def synthesize_speech_async(text: str, voice: str, rate: str = "+0%", volu
             audio_buffer.write(chunk["data"])
     return audio_buffer.getvalue()
 
-def synthesize_speech(text: str, lang_key: str, voice: Optional[str] = None) -> bytes:
-    """Synthesize speech with fallback to gTTS"""
+def synthesize_speech_gtts(text: str, lang_key: str) -> bytes:
+    """Synthesize speech with gTTS"""
+    tts = gTTS(text=text, lang=get_lang_code(lang_key))
+    buf = BytesIO()
+    with outbound_call('tts_gtts'):
+        tts.write_to_fp(buf)
+    return buf.getvalue()
+
+def synthesize_speech_edge(text: str, voice: str) -> bytes:
+    """Synthesize speech with Edge TTS on the shared event loop"""
+    future = speech_worker.submit(synthesize_speech_async(text=text, voice=voice, rate=TTS_RATE, volume=TTS_VOLUME))
+    try:
+        with outbound_call('tts_edge'):
+            return future.result(timeout=TTS_TIMEOUT_SECONDS)
+    except Exception:
+        future.cancel()
+        raise
+
+async def stream_speech_async(text: str, voice: str):
+    """Yield Edge TTS audio chunks as they arrive"""
+    communicator = edge_tts.Communicate(text=text, voice=voice, rate=TTS_RATE, volume=TTS_VOLUME)
+    async for chunk in communicator.stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
+
+def stream_edge_speech(text: str, voice: str):
+    """Edge TTS audio chunks for sync code, produced on the shared event loop"""
+    return speech_worker.stream(stream_speech_async(text, voice), timeout=TTS_TIMEOUT_SECONDS)
+
+def stream_cached_speech(text: str, lang_key: str, voice: str, key: str):
+    """Forward speech to the client chunk by chunk while writing it to the audio cache.
+
+    The clip is only committed to the cache once it is complete; a failed or
+    abandoned stream leaves nothing behind.
+    """
+    writer, temp_path = audio_cache.open_writer(key)
+    started = completed = False
+    try:
+        try:
+            with outbound_call('tts_edge'):
+                for chunk in stream_edge_speech(text, voice):
+                    started = True
+                    writer.write(chunk)
+                    yield chunk
+        except Exception:
+            if started:
+                raise
+            # Edge TTS failed before any audio was sent: fall back to gTTS in one piece, cached
+            # under the gTTS key so the Edge voice key is not filled with another engine's audio
+            audio_cache.discard(writer, temp_path)
+            audio = speech_worker.run_blocking(synthesize_speech_gtts, text, lang_key).result(timeout=TTS_TIMEOUT_SECONDS)
+            if audio:
+                audio_cache.store(gtts_audio_key(text, lang_key), audio)
+            yield audio
+            return
+        completed = True
+    finally:
+        if completed:
+            audio_cache.commit(key, writer, temp_path)
+        else:
+            audio_cache.discard(writer, temp_path)
+
+def gtts_audio_key(text: str, lang_key: str) -> str:
+    """Audio cache key of a gTTS fallback clip, kept apart from the Edge voice keys"""
+    return audio_key(text, f"gtts:{get_lang_code(lang_key)}", '', '')
+
+def cached_speech_key(text: str, lang_key: str, voice: Optional[str] = None) -> str:
+    """Audio cache key of the clip for text, synthesizing and storing it on a miss.
+
+    gTTS fallback audio is stored under its own key, so the Edge voice key is
+    only ever filled with Edge audio and Edge is tried again once it recovers.
+    """
     selected_voice = get_voice(lang_key, voice)
-    # Try Edge TTS first
+    key = audio_key(text, selected_voice, TTS_RATE, TTS_VOLUME)
+    if audio_cache.has(key):
+        return key
+    text = ' '.join(text.split())
     try:
-        return asyncio.run(synthesize_speech_async(text=text, voice=selected_voice))
+        audio = synthesize_speech_edge(text, selected_voice)
     except Exception:
-        # Fallback to gTTS when Edge TTS is blocked
-        gtts_lang = get_lang_code(lang_key)
-        tts = gTTS(text=text, lang=gtts_lang)
-        buf = BytesIO()
-        tts.write_to_fp(buf)
-        return buf.getvalue()
+        key = gtts_audio_key(text, lang_key)
+        if audio_cache.has(key):
+            return key
+        audio = speech_worker.run_blocking(synthesize_speech_gtts, text, lang_key).result(timeout=TTS_TIMEOUT_SECONDS)
+    if not audio:
+        raise RuntimeError("Speech synthesis returned no audio")
+    audio_cache.store(key, audio)
+    return key
 
 # Food Recommendation Model
 indian_foods = {
@@ -474,7 +607,8 @@ def get_nearest_city(city):
     # If not found, calculate distance to nearest city
     try:
         geolocator = Nominatim(user_agent="tourism_food_finder")
-        location = geolocator.geocode(city)
+        with outbound_call('nominatim'):
+            location = geolocator.geocode(city)
         if not location:
             return None
 
@@ -601,7 +735,8 @@ def get_location_blog_info(location):
             Please provide accurate, up-to-date, and comprehensive information. Format the response in clear sections with proper headings. Make it engaging and informative for tourists planning to visit {location}.
             """
             
-            response = model.generate_content(prompt)
+            with outbound_call('gemini'):
+                response = model.generate_content(prompt)
             return response.text
             
         except Exception as e:
@@ -727,6 +862,23 @@ def dashboard():
     else:
         return redirect(url_for('user_dashboard'))
 
+def load_user_bookings(user_id):
+    """A traveller's hotel bookings, vehicle bookings and wishlist, newest first.
+
+    The hotels, vehicles and rental companies the templates show for each row
+    are joined into the same queries, so the page costs a fixed number of
+    queries however many bookings the user has.
+    """
+    hotel_bookings = Booking.query.filter_by(user_id=user_id) \
+        .options(joinedload(Booking.hotel)) \
+        .order_by(Booking.created_at.desc()).all()
+    vehicle_bookings = VehicleBooking.query.filter_by(user_id=user_id) \
+        .options(joinedload(VehicleBooking.vehicle), joinedload(VehicleBooking.rental_company)) \
+        .order_by(VehicleBooking.created_at.desc()).all()
+    wishlist_items = Wishlist.query.filter_by(user_id=user_id) \
+        .options(joinedload(Wishlist.hotel)).all()
+    return hotel_bookings, vehicle_bookings, wishlist_items
+
 @app.route('/user/dashboard')
 @login_required
 def user_dashboard():
@@ -735,9 +887,7 @@ def user_dashboard():
         return redirect(url_for('index'))
     
     # Get both hotel and vehicle bookings
-    hotel_bookings = Booking.query.filter_by(user_id=current_user.id).order_by(Booking.created_at.desc()).all()
-    vehicle_bookings = VehicleBooking.query.filter_by(user_id=current_user.id).order_by(VehicleBooking.created_at.desc()).all()
-    wishlist_items = Wishlist.query.filter_by(user_id=current_user.id).all()
+    hotel_bookings, vehicle_bookings, wishlist_items = load_user_bookings(current_user.id)
     
     # Combine all bookings for stats
     all_bookings = list(hotel_bookings) + list(vehicle_bookings)
@@ -760,9 +910,7 @@ def manage_bookings():
         return redirect(url_for('index'))
     
     # Get both hotel and vehicle bookings
-    hotel_bookings = Booking.query.filter_by(user_id=current_user.id).order_by(Booking.created_at.desc()).all()
-    vehicle_bookings = VehicleBooking.query.filter_by(user_id=current_user.id).order_by(VehicleBooking.created_at.desc()).all()
-    wishlist_items = Wishlist.query.filter_by(user_id=current_user.id).all()
+    hotel_bookings, vehicle_bookings, wishlist_items = load_user_bookings(current_user.id)
     
     return render_template('manage_bookings.html', 
                          hotel_bookings=hotel_bookings, 
@@ -795,7 +943,6 @@ def complete_hotel_profile():
         category = request.form['category']
         # Handle amenities - get all selected amenities as a list
         amenities_list = request.form.getlist('amenities')
-        amenities = json.dumps(amenities_list)
         # Set default values for price and rooms (will be managed through room types later)
         price_per_night = 0.0  # Default price, actual prices will be set per room type
         total_rooms = 0  # Default rooms, actual count will be sum of all room types
@@ -826,13 +973,13 @@ def complete_hotel_profile():
             email=email,
             website=website,
             category=category,
-            amenities=amenities,
             price_per_night=price_per_night,
             total_rooms=total_rooms,
             available_rooms=total_rooms,  # Will be updated when room types are added
             images=hotel_image,  # Store the image path
             owner_id=current_user.id
         )
+        set_amenities(hotel, amenities_list)
         
         db.session.add(hotel)
         
@@ -845,6 +992,9 @@ def complete_hotel_profile():
     
     return render_template('complete_hotel_profile.html')
 
+# Number of bookings per page on the owner dashboards
+DASHBOARD_BOOKINGS_PAGE_SIZE = 10
+
 @app.route('/hotel/dashboard')
 @login_required
 def hotel_dashboard():
@@ -856,17 +1006,23 @@ def hotel_dashboard():
     if not current_user.profile_completed:
         return redirect(url_for('complete_hotel_profile'))
     
-    hotels = Hotel.query.filter_by(owner_id=current_user.id).all()
-    bookings = Booking.query.join(Hotel).filter(Hotel.owner_id == current_user.id).order_by(Booking.created_at.desc()).all()
+    hotels = Hotel.query.filter_by(owner_id=current_user.id).options(selectinload(Hotel.amenity_items)).all()
     
-    # Calculate total rooms count from all room types
-    total_rooms = 0
-    for hotel in hotels:
-        for room_type in hotel.room_types:
-            if room_type.is_active:
-                total_rooms += room_type.total_rooms
+    # Room counts, booking/revenue rollups and occupancy come from GROUP BY queries
+    stats = hotel_owner_summary(current_user.id)
+    
+    # Only one page of the raw booking list, with guest and hotel loaded alongside
+    cursor = request.args.get('cursor')
+    bookings, next_cursor = id_page(
+        Booking.query.join(Hotel).filter(Hotel.owner_id == current_user.id)
+        .options(joinedload(Booking.user), joinedload(Booking.hotel)),
+        Booking.id, cursor, DASHBOARD_BOOKINGS_PAGE_SIZE
+    )
     
-    return render_template('hotel_dashboard.html', hotels=hotels, bookings=bookings, total_rooms=total_rooms)
+    return render_template('hotel_dashboard.html', hotels=hotels, bookings=bookings, stats=stats,
+                           total_rooms=stats['total_rooms'],
+                           next_page_url=url_for('hotel_dashboard', cursor=next_cursor) if next_cursor else None,
+                           first_page_url=url_for('hotel_dashboard') if cursor else None)
 
 @app.route('/hotel/profile/view')
 @login_required
@@ -913,8 +1069,7 @@ def edit_hotel_profile():
         hotel.website = request.form.get('website')
         hotel.category = request.form['category']
         # Handle amenities - get all selected amenities as a list
-        amenities_list = request.form.getlist('amenities')
-        hotel.amenities = json.dumps(amenities_list)
+        set_amenities(hotel, request.form.getlist('amenities'))
         
         # Handle hotel image upload
         if 'hotel_image' in request.files:
@@ -931,6 +1086,7 @@ def edit_hotel_profile():
                 hotel.images = f"uploads/hotels/{filename}"
         
         db.session.commit()
+        hotel_search_index.upsert(hotel)
         flash('Hotel profile updated successfully!', 'success')
         return redirect(url_for('view_hotel_profile'))
     
@@ -947,7 +1103,7 @@ def manage_room_types(hotel_id):
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
-    room_types = RoomType.query.filter_by(hotel_id=hotel_id, is_active=True).all()
+    room_types = RoomType.query.filter_by(hotel_id=hotel_id, is_active=True).options(selectinload(RoomType.amenity_items)).all()
     return render_template('manage_room_types.html', hotel=hotel, room_types=room_types)
 
 @app.route('/hotel/add-room-type/<int:hotel_id>', methods=['GET', 'POST'])
@@ -977,25 +1133,15 @@ def add_room_type(hotel_id):
             max_occupancy=max_occupancy,
             price_per_night=price_per_night,
             total_rooms=total_rooms,
-            amenities=json.dumps(amenities),
             is_active=True
         )
+        set_amenities(room_type, amenities)
         
         db.session.add(room_type)
-        db.session.commit()
+        db.session.flush()
         
-        # Initialize availability for next 365 days
-        from datetime import date, timedelta
-        start_date = date.today()
-        for i in range(365):
-            current_date = start_date + timedelta(days=i)
-            availability = RoomAvailability(
-                room_type_id=room_type.id,
-                date=current_date,
-                available_rooms=total_rooms,
-                booked_rooms=0
-            )
-            db.session.add(availability)
+        # Initialize availability for the booking horizon
+        create_calendar(room_type)
         
         db.session.commit()
         
@@ -1021,11 +1167,19 @@ def edit_room_type(room_type_id):
         room_type.description = request.form['description'].strip()
         room_type.max_occupancy = int(request.form['max_occupancy'])
         room_type.price_per_night = float(request.form['price_per_night'])
-        room_type.total_rooms = int(request.form['total_rooms'])
-        room_type.amenities = json.dumps(request.form.getlist('amenities'))
+        new_total_rooms = int(request.form['total_rooms'])
+        set_amenities(room_type, request.form.getlist('amenities'))
+        
+        # Resize the availability calendar if the room count changed
+        overbooked_nights = 0
+        if new_total_rooms != room_type.total_rooms:
+            room_type.total_rooms = new_total_rooms
+            overbooked_nights = resize_calendar(room_type, new_total_rooms)
         
         db.session.commit()
         
+        if overbooked_nights:
+            flash(f'{overbooked_nights} upcoming nights have more rooms booked than the new total.', 'error')
         flash('Room type updated successfully!', 'success')
         return redirect(url_for('manage_room_types', hotel_id=hotel.id))
     
@@ -1081,8 +1235,13 @@ def reject_booking(booking_id):
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
+    was_live = booking.status in LIVE_BOOKING_STATUSES
+    if was_live:
+        release_room_nights(booking)
     booking.status = 'cancelled'
     db.session.commit()
+    if was_live:
+        room_inventory.release_booking(booking)
     
     flash('Booking rejected successfully!', 'success')
     return redirect(url_for('hotel_dashboard'))
@@ -1099,12 +1258,20 @@ def complete_booking(booking_id):
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
+    was_live = booking.status in LIVE_BOOKING_STATUSES
+    if was_live:
+        release_room_nights(booking)
     booking.status = 'completed'
     db.session.commit()
+    if was_live:
+        room_inventory.release_booking(booking)
     
     flash('Booking marked as completed!', 'success')
     return redirect(url_for('hotel_dashboard'))
 
+# Number of pending hotels/rentals listed in each approval queue
+SUPERADMIN_QUEUE_SIZE = 50
+
 @app.route('/superadmin/dashboard')
 @login_required
 def superadmin_dashboard():
@@ -1112,23 +1279,125 @@ def superadmin_dashboard():
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
-    pending_hotels = Hotel.query.filter_by(is_approved=False).all()
-    approved_hotels = Hotel.query.filter_by(is_approved=True).all()
-    all_hotels = Hotel.query.all()  # Total hotels count
-    pending_vehicle_rentals = VehicleRental.query.filter_by(is_approved=False).all()
-    approved_vehicle_rentals = VehicleRental.query.filter_by(is_approved=True).all()
-    all_users = User.query.all()
-    admins = Admin.query.all()
+    # Headline numbers are COUNT/GROUP BY tallies cached for a few seconds
+    platform_stats = platform_metrics()
+    
+    # Approval queues show the oldest requests first; the large tables load lazily from superadmin_table()
+    pending_hotels = Hotel.query.filter_by(is_approved=False).options(joinedload(Hotel.owner), selectinload(Hotel.amenity_items)) \
+        .order_by(Hotel.id.asc()).limit(SUPERADMIN_QUEUE_SIZE).all()
+    pending_vehicle_rentals = VehicleRental.query.filter_by(is_approved=False).options(joinedload(VehicleRental.owner)) \
+        .order_by(VehicleRental.id.asc()).limit(SUPERADMIN_QUEUE_SIZE).all()
+    admins = Admin.query.options(joinedload(Admin.user)).all()
     
     return render_template('superadmin_dashboard.html', 
+                         platform_stats=platform_stats,
                          pending_hotels=pending_hotels,
-                         approved_hotels=approved_hotels,
-                         all_hotels=all_hotels,
                          pending_vehicle_rentals=pending_vehicle_rentals,
-                         approved_vehicle_rentals=approved_vehicle_rentals,
-                         users=all_users,
                          admins=admins)
 
+@app.route('/superadmin/metrics')
+@login_required
+def superadmin_metrics():
+    """Headline platform numbers as JSON"""
+    if current_user.role != 'superadmin':
+        return jsonify({'error': 'Access denied'}), 403
+    
+    return jsonify(platform_metrics())
+
+def metrics_access_allowed() -> bool:
+    """Whether the client is on the metrics allow-list or presents the metrics token"""
+    if request.remote_addr in app.config['METRICS_ALLOWED_IPS']:
+        return True
+    token = app.config['METRICS_TOKEN']
+    supplied = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(supplied.encode('utf-8'), f'Bearer {token}'.encode('utf-8'))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request and outbound call metrics in the Prometheus text format, for allowed scrapers only"""
+    if not metrics_access_allowed():
+        abort(403)
+    body, content_type = metrics.render_metrics()
+    return Response(body, content_type=content_type)
+
+@app.route('/admin/cache-stats')
+@login_required
+def admin_cache_stats():
+    """Hit/miss counters of this worker's translation and speech audio caches"""
+    if current_user.role not in ['admin', 'superadmin']:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    return jsonify({'pid': os.getpid(), 'translation': translation_cache.stats(), 'tts': audio_cache.stats()})
+
+@app.route('/admin/query-stats', methods=['GET', 'POST'])
+@login_required
+def admin_query_stats():
+    """SQL query counts and timings per route for this worker; POST resets them"""
+    if current_user.role not in ['admin', 'superadmin']:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    if request.method == 'POST':
+        query_stats.reset()
+    return jsonify(query_stats.snapshot())
+
+def serialize_user_row(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'name': f'{user.first_name} {user.last_name}',
+        'email': user.email,
+        'role': user.role,
+        'joined': user.created_at.strftime('%b %d, %Y') if user.created_at else None
+    }
+
+def serialize_hotel_row(hotel):
+    return {
+        'id': hotel.id,
+        'name': hotel.name,
+        'description': hotel.description or '',
+        'owner': f'{hotel.owner.first_name} {hotel.owner.last_name}' if hotel.owner else None,
+        'location': f'{hotel.city}, {hotel.state}',
+        'rating': hotel.rating or 0,
+        'price_per_night': hotel.price_per_night,
+        'created': hotel.created_at.strftime('%b %d, %Y') if hotel.created_at else None
+    }
+
+def serialize_vehicle_rental_row(rental):
+    return {
+        'id': rental.id,
+        'name': rental.name,
+        'description': rental.description or '',
+        'owner': f'{rental.owner.first_name} {rental.owner.last_name}' if rental.owner else None,
+        'location': f'{rental.city}, {rental.state}',
+        'phone': rental.phone,
+        'created': rental.created_at.strftime('%b %d, %Y') if rental.created_at else None
+    }
+
+# Paged tables on the superadmin dashboard: query factory, id column and row serializer
+SUPERADMIN_TABLES = {
+    'users': (lambda: User.query, User.id, serialize_user_row),
+    'hotels': (lambda: Hotel.query.filter_by(is_approved=True).options(joinedload(Hotel.owner)), Hotel.id, serialize_hotel_row),
+    'vehicle-rentals': (lambda: VehicleRental.query.filter_by(is_approved=True).options(joinedload(VehicleRental.owner)),
+                        VehicleRental.id, serialize_vehicle_rental_row)
+}
+
+@app.route('/superadmin/table/<table>')
+@login_required
+def superadmin_table(table):
+    """One page of a superadmin dashboard table, newest first"""
+    if current_user.role != 'superadmin':
+        return jsonify({'error': 'Access denied'}), 403
+    if table not in SUPERADMIN_TABLES:
+        return jsonify({'error': 'Unknown table'}), 404
+    
+    make_query, id_column, serialize = SUPERADMIN_TABLES[table]
+    rows, next_cursor = id_page(make_query(), id_column, request.args.get('cursor'),
+                                page_size(request.args.get('limit', type=int)))
+    return jsonify({
+        'rows': [serialize(row) for row in rows],
+        'next_cursor': next_cursor
+    })
+
 @app.route('/admin/dashboard')
 @login_required
 def admin_dashboard():
@@ -1151,7 +1420,9 @@ def approve_hotel(hotel_id):
     hotel = Hotel.query.get_or_404(hotel_id)
     hotel.is_approved = True
     db.session.commit()
+    hotel_search_index.upsert(hotel)
     
+    invalidate_platform_metrics()
     flash(f'Hotel "{hotel.name}" has been approved!', 'success')
     return redirect(url_for('superadmin_dashboard'))
 
@@ -1165,7 +1436,9 @@ def reject_hotel(hotel_id):
     hotel = Hotel.query.get_or_404(hotel_id)
     db.session.delete(hotel)
     db.session.commit()
+    hotel_search_index.remove(hotel_id)
     
+    invalidate_platform_metrics()
     flash(f'Hotel "{hotel.name}" has been rejected and removed!', 'success')
     return redirect(url_for('superadmin_dashboard'))
 
@@ -1180,6 +1453,7 @@ def approve_vehicle_rental(rental_id):
     rental.is_approved = True
     db.session.commit()
     
+    invalidate_platform_metrics()
     flash(f'Vehicle Rental Company "{rental.name}" has been approved!', 'success')
     return redirect(url_for('superadmin_dashboard'))
 
@@ -1194,6 +1468,7 @@ def reject_vehicle_rental(rental_id):
     db.session.delete(rental)
     db.session.commit()
     
+    invalidate_platform_metrics()
     flash(f'Vehicle Rental Company "{rental.name}" has been rejected and removed!', 'success')
     return redirect(url_for('superadmin_dashboard'))
 
@@ -1204,11 +1479,15 @@ def add_admin():
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
-    user_id = request.form['user_id']
+    user_id = request.form.get('user_id', type=int)
+    username = request.form.get('username', '').strip()
     permissions = request.form.get('permissions', '[]')
     
     # Check if user exists and is not already an admin
-    user = User.query.get(user_id)
+    if user_id:
+        user = User.query.get(user_id)
+    else:
+        user = User.query.filter(or_(User.username == username, User.email == username)).first() if username else None
     if not user:
         flash('User not found!', 'error')
         return redirect(url_for('superadmin_dashboard'))
@@ -1222,7 +1501,7 @@ def add_admin():
     
     # Create admin record
     admin = Admin(
-        user_id=user_id,
+        user_id=user.id,
         permissions=permissions,
         created_by=current_user.id
     )
@@ -1230,99 +1509,114 @@ def add_admin():
     db.session.add(admin)
     db.session.commit()
     
+    invalidate_platform_metrics()
     flash(f'User "{user.username}" has been promoted to admin!', 'success')
     return redirect(url_for('superadmin_dashboard'))
 
+def hotel_search_args():
+    """Read the /hotels filters from the query string"""
+    search = request.args.get('search', '')
+    return {
+        'query': search,
+        'city': request.args.get('city', ''),
+        'category': request.args.get('category', ''),
+        'min_price': request.args.get('min_price', type=float),
+        'max_price': request.args.get('max_price', type=float),
+        'min_rating': request.args.get('min_rating', type=int),
+        'amenities': request.args.getlist('amenities'),
+        'sort_by': request.args.get('sort_by', 'relevance' if search else 'name'),
+        'sort_order': request.args.get('sort_order', 'asc')
+    }
+
+def load_hotels_in_order(hotel_ids):
+    """Load hotels by id in one query, keeping the given order"""
+    if not hotel_ids:
+        return []
+    hotels_by_id = {hotel.id: hotel for hotel in
+                    Hotel.query.filter(Hotel.id.in_(hotel_ids)).options(selectinload(Hotel.amenity_items)).all()}
+    return [hotels_by_id[hotel_id] for hotel_id in hotel_ids if hotel_id in hotels_by_id]
+
+def serialize_hotel(hotel):
+    return {
+        'id': hotel.id,
+        'name': hotel.name,
+        'address': hotel.address,
+        'city': hotel.city,
+        'country': hotel.country,
+        'category': hotel.category,
+        'price_per_night': hotel.price_per_night,
+        'rating': hotel.rating,
+        'total_reviews': hotel.total_reviews,
+        'amenities': hotel.amenity_names,
+        'image': hotel.images
+    }
+
 @app.route('/hotels')
 def hotels():
     # Get all search parameters
-    search = request.args.get('search', '')
-    city = request.args.get('city', '')
-    min_price = request.args.get('min_price', type=float)
-    max_price = request.args.get('max_price', type=float)
-    min_rating = request.args.get('min_rating', type=int)
-    amenities = request.args.getlist('amenities')
-    sort_by = request.args.get('sort_by', 'name')
-    sort_order = request.args.get('sort_order', 'asc')
-    
-    # Build query
-    query = Hotel.query.filter_by(is_approved=True)
-    
-    # Text search
-    if search:
-        query = query.filter(
-            or_(
-                Hotel.name.contains(search),
-                Hotel.description.contains(search),
-                Hotel.city.contains(search),
-                Hotel.address.contains(search)
-            )
-        )
-    
-    # City filter
-    if city:
-        query = query.filter_by(city=city)
-    
-    # Price range filter
-    if min_price is not None:
-        query = query.filter(Hotel.price_per_night >= min_price)
-    if max_price is not None:
-        query = query.filter(Hotel.price_per_night <= max_price)
-    
-    # Rating filter
-    if min_rating:
-        query = query.filter(Hotel.rating >= min_rating)
-    
-    # Amenities filter
-    if amenities:
-        for amenity in amenities:
-            query = query.filter(Hotel.amenities.contains(f'"{amenity}"'))
-    
-    # Sorting
-    if sort_by == 'price':
-        if sort_order == 'desc':
-            query = query.order_by(Hotel.price_per_night.desc())
-        else:
-            query = query.order_by(Hotel.price_per_night.asc())
-    elif sort_by == 'rating':
-        if sort_order == 'desc':
-            query = query.order_by(Hotel.rating.desc())
-        else:
-            query = query.order_by(Hotel.rating.asc())
-    elif sort_by == 'name':
-        if sort_order == 'desc':
-            query = query.order_by(Hotel.name.desc())
-        else:
-            query = query.order_by(Hotel.name.asc())
+    filters = hotel_search_args()
+    cursor = request.args.get('cursor')
     
-    hotels = query.all()
+    # Ranked search, filters, facets and keyset paging come from the in-process index
+    results = hotel_search_index.search(cursor=cursor, limit=page_size(request.args.get('limit', type=int)), **filters)
     
-    # Get filter options
-    cities = db.session.query(Hotel.city).filter_by(is_approved=True).distinct().all()
-    cities = [city[0] for city in cities]
+    # Load only the hotels on this page, keeping the index order
+    hotels = load_hotels_in_order(results['ids'])
     
-    # Get all unique amenities
-    all_amenities = set()
-    for hotel in Hotel.query.filter_by(is_approved=True).all():
-        if hotel.amenities:
-            try:
-                hotel_amenities = json.loads(hotel.amenities)
-                all_amenities.update(hotel_amenities)
-            except:
-                pass
+    # Keyset paging links carry the current filters plus the cursor
+    page_args = request.args.to_dict(flat=False)
+    page_args.pop('cursor', None)
+    first_page_url = url_for('hotels', **page_args) if cursor else None
+    next_page_url = url_for('hotels', cursor=results['next_cursor'], **page_args) if results['next_cursor'] else None
     
     return render_template('hotels.html', 
                          hotels=hotels, 
-                         cities=cities, 
-                         all_amenities=sorted(all_amenities),
-                         search=search, 
-                         selected_city=city,
-                         min_price=min_price,
-                         max_price=max_price,
-                         min_rating=min_rating,
-                         selected_amenities=amenities,
-                         sort_by=sort_by,
-                         sort_order=sort_order)
+                         total_hotels=results['total'],
+                         cities=results['facets']['cities'], 
+                         all_amenities=list(results['facets']['amenities']),
+                         amenity_counts=results['facets']['amenities'],
+                         category_counts=results['facets']['categories'],
+                         next_page_url=next_page_url,
+                         first_page_url=first_page_url,
+                         search=filters['query'], 
+                         selected_city=filters['city'],
+                         selected_category=filters['category'],
+                         min_price=filters['min_price'],
+                         max_price=filters['max_price'],
+                         min_rating=filters['min_rating'],
+                         selected_amenities=filters['amenities'],
+                         sort_by=results['sort_by'],
+                         sort_order=filters['sort_order'])
+
+# Reviews rendered with a hotel page and fetched per scroll step
+REVIEWS_PAGE_SIZE = 10
+
+@app.route('/api/hotels')
+def api_hotels():
+    """JSON hotel listing with the /hotels filters and keyset pagination.
+
+    Pass stream=1 to receive every match as one streamed JSON document
+    instead of a single page.
+    """
+    filters = hotel_search_args()
+    
+    if request.args.get('stream') == '1':
+        def fetch_page(cursor):
+            results = hotel_search_index.search(cursor=cursor, limit=MAX_PAGE_SIZE, **filters)
+            return load_hotels_in_order(results['ids']), results['next_cursor']
+        
+        return Response(stream_with_context(stream_json_array('hotels', fetch_page, serialize_hotel, {'success': True})),
+                        mimetype='application/json')
+    
+    results = hotel_search_index.search(cursor=request.args.get('cursor'),
+                                        limit=page_size(request.args.get('limit', type=int)), **filters)
+    return jsonify({
+        'success': True,
+        'hotels': [serialize_hotel(hotel) for hotel in load_hotels_in_order(results['ids'])],
+        'total': results['total'],
+        'facets': results['facets'],
+        'next_cursor': results['next_cursor']
+    })
 
 @app.route('/hotel/<int:hotel_id>')
 def hotel_detail(hotel_id):
@@ -1343,17 +1637,8 @@ def hotel_detail(hotel_id):
             check_in = datetime.strptime(check_in_str, '%Y-%m-%d').date()
             check_out = datetime.strptime(check_out_str, '%Y-%m-%d').date()
             
-            # Calculate rooms booked during this period
-            overlapping_bookings = Booking.query.filter(
-                Booking.hotel_id == hotel_id,
-                Booking.status.in_(['pending', 'confirmed']),
-                Booking.check_in < check_out,
-                Booking.check_out > check_in
-            ).all()
-            
-            # Calculate total rooms booked during this period
-            total_booked = sum(booking.rooms for booking in overlapping_bookings)
-            available_rooms = max(0, hotel.total_rooms - total_booked)
+            # Free rooms on the busiest night of the stay; this feeds the booking form, so read it live
+            available_rooms = room_inventory.live_free_rooms('hotel', hotel_id, hotel.total_rooms, check_in, check_out)
             
         except ValueError:
             # Invalid date format, use default
@@ -1364,12 +1649,48 @@ def hotel_detail(hotel_id):
         available_rooms = hotel.total_rooms
     
     # Get room types for this hotel
-    room_types = RoomType.query.filter_by(hotel_id=hotel_id, is_active=True).all()
-    
-    # Get reviews for this hotel (ordered by most recent)
-    reviews = Review.query.filter_by(hotel_id=hotel_id, is_verified=True).order_by(Review.created_at.desc()).all()
+    room_types = RoomType.query.filter_by(hotel_id=hotel_id, is_active=True).options(selectinload(RoomType.amenity_items)).all()
+    
+    # First page of reviews (most recent first) plus the star histogram; the rest load on scroll
+    reviews, reviews_cursor = hotel_review_page(hotel_id, None, REVIEWS_PAGE_SIZE)
+    histogram = rating_histogram(Review, hotel_id)
+    
+    return render_template('hotel_detail.html', hotel=hotel, available_rooms=available_rooms, room_types=room_types,
+                           reviews=reviews, reviews_cursor=reviews_cursor, histogram=histogram,
+                           max_calendar_days=MAX_CALENDAR_DAYS)
+
+def hotel_review_page(hotel_id, cursor, limit):
+    """One newest-first page of a hotel's verified reviews with their authors"""
+    query = Review.query.filter_by(hotel_id=hotel_id, is_verified=True).options(joinedload(Review.user))
+    return id_page(query, Review.id, cursor, limit)
+
+def serialize_review(review):
+    """JSON representation of a review for the infinite-scroll endpoint"""
+    return {
+        'id': review.id,
+        'author': f"{review.user.first_name} {review.user.last_name}",
+        'rating': review.rating,
+        'title': review.title,
+        'comment': review.comment,
+        'is_verified': review.is_verified,
+        'created_at': review.created_at.isoformat() if review.created_at else None,
+        'created_at_display': review.created_at.strftime('%B %d, %Y') if review.created_at else ''
+    }
+
+@app.route('/api/hotel/<int:hotel_id>/reviews')
+def api_hotel_reviews(hotel_id):
+    """Next page of a hotel's verified reviews for infinite scrolling"""
+    hotel = Hotel.query.get_or_404(hotel_id)
+    if not hotel.is_approved:
+        return jsonify({'success': False, 'error': 'Hotel not found'}), 404
     
-    return render_template('hotel_detail.html', hotel=hotel, available_rooms=available_rooms, room_types=room_types, reviews=reviews)
+    reviews, next_cursor = hotel_review_page(hotel_id, request.args.get('cursor'),
+                                             page_size(request.args.get('limit', type=int) or REVIEWS_PAGE_SIZE))
+    return jsonify({
+        'success': True,
+        'reviews': [serialize_review(review) for review in reviews],
+        'next_cursor': next_cursor
+    })
 
 @app.route('/book-room/<int:room_type_id>', methods=['GET', 'POST'])
 @login_required
@@ -1412,19 +1733,9 @@ def book_room_type(room_type_id):
         nights = (check_out - check_in).days
         total_amount = nights * rooms * room_type.price_per_night
         
-        # Check if enough rooms are available
-        overlapping_bookings = Booking.query.filter(
-            Booking.room_type_id == room_type_id,
-            Booking.status.in_(['pending', 'confirmed']),
-            Booking.check_in < check_out,
-            Booking.check_out > check_in
-        ).all()
-        
-        total_booked = sum(booking.rooms for booking in overlapping_bookings)
-        total_rooms = room_type.total_rooms or 0
-        available_rooms = max(0, total_rooms - total_booked)
-        
-        if rooms > available_rooms:
+        # Reserve the nights in the availability calendar
+        if not reserve_room_nights(room_type, check_in, check_out, rooms):
+            available_rooms = room_type_free_rooms(room_type, check_in, check_out)
             flash(f'Only {available_rooms} rooms available for the selected dates!', 'error')
             return redirect(url_for('book_room_type', room_type_id=room_type_id))
         
@@ -1446,6 +1757,7 @@ def book_room_type(room_type_id):
         
         db.session.add(booking)
         db.session.commit()
+        room_inventory.record_booking(booking)
         
         flash('Booking created successfully! Please complete payment to confirm your reservation.', 'success')
         return redirect(url_for('booking_confirmation', booking_id=booking.id))
@@ -1494,17 +1806,11 @@ def book_hotel(hotel_id):
             available_rooms = hotel.available_rooms or 0 or 0
             return render_template('book_hotel.html', hotel=hotel, available_rooms=available_rooms)
         
-        # Check room availability for the specific date range
-        overlapping_bookings = Booking.query.filter(
-            Booking.hotel_id == hotel_id,
-            Booking.status.in_(['pending', 'confirmed']),
-            Booking.check_in < check_out,
-            Booking.check_out > check_in
-        ).all()
+        # Hold the hotel row so concurrent bookings of this hotel count one after another
+        lock_for_booking(Hotel, hotel.id)
         
-        total_booked = sum(booking.rooms for booking in overlapping_bookings)
-        total_rooms = hotel.total_rooms or 0
-        available_rooms = max(0, total_rooms - total_booked)
+        # Check room availability for the specific date range against live bookings
+        available_rooms = room_inventory.live_free_rooms('hotel', hotel_id, hotel.total_rooms, check_in, check_out)
         
         if rooms > available_rooms:
             flash(f'Only {available_rooms} rooms available for the selected dates!', 'error')
@@ -1533,7 +1839,18 @@ def book_hotel(hotel_id):
         )
         
         db.session.add(booking)
+        db.session.flush()
+        
+        # Count again including this booking; on SQLite, which ignores the row lock, this is what stops two
+        # workers taking the same nights
+        if room_inventory.live_peak_booked('hotel', hotel_id, check_in, check_out) > (hotel.total_rooms or 0):
+            db.session.rollback()
+            available_rooms = room_inventory.live_free_rooms('hotel', hotel_id, hotel.total_rooms, check_in, check_out)
+            flash(f'Only {available_rooms} rooms available for the selected dates!', 'error')
+            return render_template('book_hotel.html', hotel=hotel, available_rooms=available_rooms)
+        
         db.session.commit()
+        room_inventory.record_booking(booking)
         
         flash(f'Booking successful! Your booking reference is: {booking_ref}', 'success')
         return redirect(url_for('booking_confirmation', booking_id=booking.id))
@@ -2671,7 +2988,8 @@ ICONIC_PLACES = {
 def get_coordinates(location_name):
     """Get coordinates for a location using OpenRouteService API"""
     url = f"https://api.openrouteservice.org/geocode/search?api_key={ORS_API_KEY}&text={location_name}"
-    resp = requests.get(url)
+    with outbound_call('openrouteservice'):
+        resp = requests.get(url)
     if resp.status_code == 200:
         features = resp.json().get("features", [])
         if features:
@@ -2682,7 +3000,8 @@ def get_coordinates(location_name):
 def reverse_geocode(lon, lat):
     """Reverse geocode coordinates to get city name"""
     url = f"https://api.openrouteservice.org/geocode/reverse?api_key={ORS_API_KEY}&point.lon={lon}&point.lat={lat}&size=1"
-    resp = requests.get(url)
+    with outbound_call('openrouteservice'):
+        resp = requests.get(url)
     if resp.status_code == 200:
         features = resp.json().get("features", [])
         if features:
@@ -2706,7 +3025,8 @@ def get_top_attractions(city_name, api_key, limit=5):
         f"?radius=20000&lon={lon}&lat={lat}&apikey={api_key}"
         f"&kinds=architecture,historic,cultural,religion&limit=50"
     )
-    resp = requests.get(url)
+    with outbound_call('opentripmap'):
+        resp = requests.get(url)
     if resp.status_code != 200:
         return []
     
@@ -2743,7 +3063,8 @@ def get_cities_along_route(route_coords, api_key, limit=5):
     for lon, lat in sampled_points:
         found_city = None
         url = f"https://api.opentripmap.com/0.1/en/places/radius?radius=20000&lon={lon}&lat={lat}&apikey={api_key}&kinds=urban,other,settlements&limit=5"
-        resp = requests.get(url)
+        with outbound_call('opentripmap'):
+            resp = requests.get(url)
         if resp.status_code == 200:
             places = resp.json().get("features", [])
             for place in places:
@@ -2795,7 +3116,8 @@ def generate_comprehensive_itinerary(start_name, end_name, total_available_time_
         route_url = "https://api.openrouteservice.org/v2/directions/driving-car"
         headers = {"Authorization": ORS_API_KEY, "Content-Type": "application/json"}
         body = {"coordinates": [start, end]}
-        response = requests.post(route_url, json=body, headers=headers)
+        with outbound_call('openrouteservice'):
+            response = requests.post(route_url, json=body, headers=headers)
         if response.status_code != 200:
             return {"error": f"Route planning error: {response.text}"}
 
@@ -3184,16 +3506,8 @@ def check_room_availability(hotel_id):
         
         hotel = Hotel.query.get_or_404(hotel_id)
         
-        # Calculate rooms booked during this period
-        overlapping_bookings = Booking.query.filter(
-            Booking.hotel_id == hotel_id,
-            Booking.status.in_(['pending', 'confirmed']),
-            Booking.check_in < check_out,
-            Booking.check_out > check_in
-        ).all()
-        
-        # Calculate total rooms booked during this period
-        total_booked = sum(booking.rooms for booking in overlapping_bookings)
+        # Rooms booked on the busiest night of this period
+        total_booked = room_inventory.peak_booked('hotel', hotel_id, check_in, check_out)
         available_rooms = max(0, hotel.total_rooms - total_booked)
         
         return jsonify({
@@ -3222,44 +3536,21 @@ def check_room_type_availability(room_type_id):
         
         room_type = RoomType.query.get_or_404(room_type_id)
         
-        # Get all overlapping bookings for this room type
-        overlapping_bookings = Booking.query.filter(
-            Booking.room_type_id == room_type_id,
-            Booking.status.in_(['pending', 'confirmed']),
-            Booking.check_in < check_out,
-            Booking.check_out > check_in
-        ).all()
-        
         # Calculate availability for each date in the range
         availability_data = []
-        current_date = check_in
-        min_available = float('inf')
-        
-        while current_date < check_out:
-            # Count rooms booked on this specific date
-            rooms_booked_on_date = 0
-            for booking in overlapping_bookings:
-                # Check if this booking overlaps with the current date
-                if booking.check_in <= current_date < booking.check_out:
-                    rooms_booked_on_date += booking.rooms
-            
-            # Calculate available rooms for this date
-            total_rooms = room_type.total_rooms or 0
-            available_rooms = max(0, total_rooms - rooms_booked_on_date)
-            min_available = min(min_available, available_rooms)
-            
+        min_available = None
+        for night, available_rooms, rooms_booked_on_date in room_type_nightly(room_type, check_in, check_out):
+            min_available = available_rooms if min_available is None else min(min_available, available_rooms)
             availability_data.append({
-                'date': current_date.isoformat(),
+                'date': night.isoformat(),
                 'available_rooms': available_rooms,
                 'total_rooms': room_type.total_rooms,
                 'booked_rooms': rooms_booked_on_date
             })
-            
-            current_date += timedelta(days=1)
         
-        # Ensure min_available is not infinity
-        if min_available == float('inf'):
+        if min_available is None:
             min_available = 0
+        overlapping_count = room_inventory.overlapping_count('room_type', room_type_id, check_in, check_out)
         
         return jsonify({
             'room_type_id': room_type_id,
@@ -3271,7 +3562,7 @@ def check_room_type_availability(room_type_id):
             'availability_by_date': availability_data,
             'check_in': check_in.isoformat(),
             'check_out': check_out.isoformat(),
-            'overlapping_bookings_count': len(overlapping_bookings)
+            'overlapping_bookings_count': overlapping_count
         })
         
     except ValueError:
@@ -3294,44 +3585,19 @@ def check_vehicle_availability(vehicle_id):
         
         vehicle = Vehicle.query.get_or_404(vehicle_id)
         
-        # Get all overlapping bookings for this vehicle
-        # A booking overlaps if it starts before the requested end date AND ends after the requested start date
-        overlapping_bookings = VehicleBooking.query.filter(
-            VehicleBooking.vehicle_id == vehicle_id,
-            VehicleBooking.status.in_(['pending', 'confirmed']),
-            VehicleBooking.pickup_date < return_date,
-            VehicleBooking.return_date > pickup_date
-        ).all()
-        
         # Calculate availability for each date in the range
         availability_data = []
-        current_date = pickup_date
-        min_available = float('inf')
-        
-        while current_date < return_date:
-            # Count vehicles booked on this specific date
-            vehicles_booked_on_date = 0
-            for booking in overlapping_bookings:
-                # Check if this booking overlaps with the current date
-                if booking.pickup_date <= current_date < booking.return_date:
-                    vehicles_booked_on_date += 1
-            
-            # Calculate available vehicles for this date
-            available_vehicles = max(0, vehicle.total_vehicles - vehicles_booked_on_date)
-            min_available = min(min_available, available_vehicles)
-            
+        # Read live: the booking form relies on this answer
+        for day, vehicles_booked_on_date in fleet_inventory.live_nightly_booked('vehicle', vehicle_id, pickup_date, return_date):
             availability_data.append({
-                'date': current_date.isoformat(),
-                'available_vehicles': available_vehicles,
+                'date': day.isoformat(),
+                'available_vehicles': max(0, vehicle.total_vehicles - vehicles_booked_on_date),
                 'total_vehicles': vehicle.total_vehicles,
                 'booked_vehicles': vehicles_booked_on_date
             })
-            
-            current_date += timedelta(days=1)
         
-        # Ensure min_available is not infinity
-        if min_available == float('inf'):
-            min_available = 0
+        min_available = fleet_inventory.live_free_units(vehicle, pickup_date, return_date)
+        overlapping_count = fleet_inventory.live_overlapping_count('vehicle', vehicle_id, pickup_date, return_date)
         
         return jsonify({
             'vehicle_id': vehicle_id,
@@ -3343,7 +3609,7 @@ def check_vehicle_availability(vehicle_id):
             'availability_by_date': availability_data,
             'pickup_date': pickup_date.isoformat(),
             'return_date': return_date.isoformat(),
-            'overlapping_bookings_count': len(overlapping_bookings)
+            'overlapping_bookings_count': overlapping_count
         })
         
     except ValueError:
@@ -3351,11 +3617,77 @@ def check_vehicle_availability(vehicle_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Longest window the batch availability calendar will compute
+MAX_CALENDAR_DAYS = 93
+
+def parse_id_list(value):
+    """Parse a comma-separated list of integer ids from a query parameter"""
+    ids = []
+    for part in (value or '').split(','):
+        part = part.strip()
+        if part:
+            ids.append(int(part))
+    return ids
+
+@app.route('/api/availability-calendar')
+def availability_calendar():
+    """API endpoint returning nightly availability for many room types and vehicles at once"""
+    try:
+        room_type_ids = parse_id_list(request.args.get('room_type_ids'))
+        vehicle_ids = parse_id_list(request.args.get('vehicle_ids'))
+        if not room_type_ids and not vehicle_ids:
+            return jsonify({'error': 'room_type_ids or vehicle_ids is required'}), 400
+        
+        start_str = request.args.get('start')
+        start = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else date.today()
+        end_str = request.args.get('end')
+        if end_str:
+            days = (datetime.strptime(end_str, '%Y-%m-%d').date() - start).days
+        else:
+            days = request.args.get('days', 31, type=int)
+        
+        if days <= 0:
+            return jsonify({'error': 'End date must be after start date'}), 400
+        if days > MAX_CALENDAR_DAYS:
+            return jsonify({'error': f'Calendar window is limited to {MAX_CALENDAR_DAYS} days'}), 400
+        
+        room_types = RoomType.query.filter(RoomType.id.in_(room_type_ids)).all() if room_type_ids else []
+        vehicles = Vehicle.query.filter(Vehicle.id.in_(vehicle_ids)).all() if vehicle_ids else []
+        
+        return jsonify({
+            'start': start.isoformat(),
+            'days': days,
+            'dates': [(start + timedelta(days=i)).isoformat() for i in range(days)],
+            'room_types': {str(k): v for k, v in room_type_calendar(room_types, start, days).items()},
+            'vehicles': {str(k): v for k, v in vehicle_calendar(vehicles, start, days).items()}
+        })
+        
+    except ValueError:
+        return jsonify({'error': 'Invalid date or id format'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/cancel_booking/<int:booking_id>')
 @login_required
 def cancel_booking(booking_id):
     booking = Booking.query.get_or_404(booking_id)
     
+    if booking.user_id != current_user.id:
+        flash('Access denied!', 'error')
+        return redirect(url_for('index'))
+    
+    if booking.status not in LIVE_BOOKING_STATUSES:
+        flash('This booking can no longer be cancelled.', 'error')
+        return redirect(url_for('user_dashboard'))
+    
+    release_room_nights(booking)
+    booking.status = 'cancelled'
+    db.session.commit()
+    room_inventory.release_booking(booking)
+    
+    flash('Booking cancelled successfully!', 'success')
+    return redirect(url_for('user_dashboard'))
+
 # Hotel Review Routes
 @app.route('/hotel/<int:hotel_id>/review', methods=['GET', 'POST'])
 @login_required
@@ -3424,10 +3756,11 @@ def submit_hotel_review(hotel_id):
         
         db.session.add(review)
         
-        # Update hotel rating
-        update_hotel_rating(hotel_id)
+        # Update hotel rating in the same transaction as the review
+        review_added(review)
         
         db.session.commit()
+        hotel_search_index.upsert(hotel)
         
         flash('Thank you for your review!', 'success')
         return redirect(url_for('hotel_detail', hotel_id=hotel_id))
@@ -3509,8 +3842,8 @@ def submit_vehicle_review(rental_id):
         
         db.session.add(review)
         
-        # Update rental company rating
-        update_vehicle_rental_rating(rental_id)
+        # Update rental company rating in the same transaction as the review
+        review_added(review)
         
         db.session.commit()
         
@@ -3526,51 +3859,32 @@ def submit_vehicle_review(rental_id):
     
     return render_template('submit_vehicle_review.html', rental_company=rental_company, bookings=bookings)
 
-def update_hotel_rating(hotel_id):
-    """Update hotel's average rating and total reviews count"""
-    hotel = Hotel.query.get(hotel_id)
-    if not hotel:
-        return
-    
-    reviews = Review.query.filter_by(hotel_id=hotel_id, is_verified=True).all()
-    
-    if reviews:
-        total_rating = sum(review.rating for review in reviews)
-        average_rating = total_rating / len(reviews)
-        hotel.rating = round(average_rating, 1)
-        hotel.total_reviews = len(reviews)
-    else:
-        hotel.rating = 0.0
-        hotel.total_reviews = 0
-    
-    db.session.commit()
+def verify_database_indexes():
+    """Warn when indexes declared on the models are missing from the database"""
+    missing = missing_indexes(db.engine)
+    if missing:
+        print(f"Warning: missing database indexes: {', '.join(missing)}. Run migrate_indexes.py to create them.")
+    return missing
 
-def update_vehicle_rental_rating(rental_id):
-    """Update vehicle rental company's average rating and total reviews count"""
-    rental_company = VehicleRental.query.get(rental_id)
-    if not rental_company:
+# Check the schema once per worker process, on its first request
+_indexes_verified = False
+
+@app.before_request
+def verify_database_indexes_once():
+    global _indexes_verified
+    if _indexes_verified:
         return
-    
-    reviews = VehicleReview.query.filter_by(rental_company_id=rental_id, is_verified=True).all()
-    
-    if reviews:
-        total_rating = sum(review.rating for review in reviews)
-        average_rating = total_rating / len(reviews)
-        rental_company.rating = round(average_rating, 1)
-        rental_company.total_reviews = len(reviews)
-    else:
-        rental_company.rating = 0.0
-        rental_company.total_reviews = 0
-    
-    db.session.commit()
-    
-    flash('Booking cancelled successfully!', 'success')
-    return redirect(url_for('user_dashboard'))
+    _indexes_verified = True
+    try:
+        verify_database_indexes()
+    except Exception as e:
+        print(f"Could not verify database indexes: {e}")
 
 # Initialize database and create superadmin
 def init_db():
     with app.app_context():
         db.create_all()
+        verify_database_indexes()
         
         # Create superadmin if not exists
         superadmin = User.query.filter_by(username='superadmin').first()
@@ -3589,104 +3903,194 @@ def init_db():
 
 
 # Vehicle Rental Routes
-@app.route('/vehicle-rentals')
-def vehicle_rentals():
-    """Vehicle rentals listing page"""
-    # Get search and filter parameters
-    search = request.args.get('search', '').strip()
-    city = request.args.get('city', '').strip()
-    min_price = request.args.get('min_price', type=float)
-    max_price = request.args.get('max_price', type=float)
-    vehicle_type = request.args.get('vehicle_type', '').strip()
-    transmission = request.args.get('transmission', '').strip()
-    fuel_type = request.args.get('fuel_type', '').strip()
-    sort_by = request.args.get('sort_by', 'name')
-    sort_order = request.args.get('sort_order', 'asc')
+def vehicle_rental_args():
+    """Read the /vehicle-rentals filters from the query string"""
+    return {
+        'search': request.args.get('search', '').strip(),
+        'city': request.args.get('city', '').strip(),
+        'min_price': request.args.get('min_price', type=float),
+        'max_price': request.args.get('max_price', type=float),
+        'vehicle_type': request.args.get('vehicle_type', '').strip(),
+        'transmission': request.args.get('transmission', '').strip(),
+        'fuel_type': request.args.get('fuel_type', '').strip(),
+        'features': request.args.getlist('features'),
+        'sort_by': request.args.get('sort_by', 'name'),
+        'sort_order': request.args.get('sort_order', 'asc')
+    }
+
+def matching_vehicle_conditions(filters):
+    """Vehicle-level filter conditions shared by the listing query and its vehicle lists"""
+    conditions = [Vehicle.is_active == True]
+    if filters['vehicle_type']:
+        conditions.append(Vehicle.vehicle_type == filters['vehicle_type'])
+    if filters['transmission']:
+        conditions.append(Vehicle.transmission == filters['transmission'])
+    if filters['fuel_type']:
+        conditions.append(Vehicle.fuel_type == filters['fuel_type'])
+    if filters['min_price']:
+        conditions.append(Vehicle.price_per_day >= filters['min_price'])
+    if filters['max_price']:
+        conditions.append(Vehicle.price_per_day <= filters['max_price'])
+    if filters['features']:
+        conditions.append(Vehicle.id.in_(filter_by_amenities(db.session.query(Vehicle.id), Vehicle, filters['features'])))
+    return conditions
+
+def vehicle_rental_query(filters):
+    """Approved rental companies with at least one matching vehicle, plus the sort expression.
+
+    Matching vehicles are aggregated once per company (GROUP BY) and joined,
+    so companies without matches drop out and price sorting uses the real
+    minimum price, all in a single statement.
+    """
+    conditions = matching_vehicle_conditions(filters)
+    summary = (
+        db.session.query(
+            Vehicle.rental_company_id.label('rental_company_id'),
+            func.min(Vehicle.price_per_day).label('min_price')
+        )
+        .filter(*conditions)
+        .group_by(Vehicle.rental_company_id)
+        .subquery()
+    )
     
     # Build query - Show vehicles only from approved rental companies
-    query = VehicleRental.query.filter_by(is_approved=True)
+    query = VehicleRental.query.join(summary, summary.c.rental_company_id == VehicleRental.id).filter(VehicleRental.is_approved == True)
     
-    # Apply filters
+    search = filters['search']
     if search:
         # Search in rental company details and also in their vehicles
-        search_conditions = [
-            VehicleRental.name.ilike(f'%{search}%'),
-            VehicleRental.city.ilike(f'%{search}%'),
-            VehicleRental.description.ilike(f'%{search}%')
-        ]
-        
-        # Also search in vehicle make and model
-        vehicle_search_rentals = db.session.query(VehicleRental.id).join(Vehicle).filter(
+        vehicle_search_rentals = db.session.query(Vehicle.rental_company_id).filter(
             or_(
                 Vehicle.make.ilike(f'%{search}%'),
                 Vehicle.model.ilike(f'%{search}%')
             )
-        ).subquery()
-        
-        search_conditions.append(VehicleRental.id.in_(db.session.query(vehicle_search_rentals.c.id)))
-        
-        query = query.filter(or_(*search_conditions))
-    
-    if city:
-        query = query.filter(VehicleRental.city.ilike(f'%{city}%'))
+        )
+        query = query.filter(or_(
+            VehicleRental.name.ilike(f'%{search}%'),
+            VehicleRental.city.ilike(f'%{search}%'),
+            VehicleRental.description.ilike(f'%{search}%'),
+            VehicleRental.id.in_(vehicle_search_rentals)
+        ))
+    
+    if filters['city']:
+        query = query.filter(VehicleRental.city.ilike(f'%{filters["city"]}%'))
+    
+    # Sort keys are paired with the id in keyset_page() so ties stay stable
+    sort_expressions = {
+        'name': VehicleRental.name,
+        'rating': func.coalesce(VehicleRental.rating, 0.0),
+        'city': VehicleRental.city,
+        'price': summary.c.min_price
+    }
+    return query, sort_expressions.get(filters['sort_by'], VehicleRental.name), conditions
+
+def vehicle_rental_page(filters, cursor, limit):
+    """One keyset page of rental companies, each with its matching vehicles and their summary"""
+    query, sort_expression, conditions = vehicle_rental_query(filters)
+    rentals, next_cursor = keyset_page(query, sort_expression, VehicleRental.id,
+                                       filters['sort_order'] == 'desc', cursor, limit)
+    
+    # Matching vehicles for the whole page in one query instead of one per company
+    vehicles_by_rental = {rental.id: [] for rental in rentals}
+    if rentals:
+        vehicles = Vehicle.query.filter(Vehicle.rental_company_id.in_(list(vehicles_by_rental)), *conditions) \
+            .order_by(Vehicle.price_per_day.asc(), Vehicle.id.asc()).all()
+        for vehicle in vehicles:
+            vehicles_by_rental[vehicle.rental_company_id].append(vehicle)
     
-    # Apply sorting
-    if sort_by == 'name':
-        query = query.order_by(VehicleRental.name.asc() if sort_order == 'asc' else VehicleRental.name.desc())
-    elif sort_by == 'rating':
-        query = query.order_by(VehicleRental.rating.desc() if sort_order == 'desc' else VehicleRental.rating.asc())
-    elif sort_by == 'city':
-        query = query.order_by(VehicleRental.city.asc() if sort_order == 'asc' else VehicleRental.city.desc())
-    elif sort_by == 'price':
-        # For price sorting, we'll need to join with vehicles and sort by min price
-        query = query.order_by(VehicleRental.name.asc())  # Default fallback
+    for rental in rentals:
+        rental.matching_vehicles = vehicles_by_rental[rental.id]
+        rental.vehicle_summary = {
+            'min_price_per_day': rental.matching_vehicles[0].price_per_day if rental.matching_vehicles else None,
+            'vehicle_count': len(rental.matching_vehicles),
+            'vehicle_types': sorted({vehicle.vehicle_type for vehicle in rental.matching_vehicles}),
+            'transmissions': sorted({vehicle.transmission for vehicle in rental.matching_vehicles}),
+            'fuel_types': sorted({vehicle.fuel_type for vehicle in rental.matching_vehicles})
+        }
+    return rentals, next_cursor
+
+def serialize_vehicle_rental(rental):
+    return {
+        'id': rental.id,
+        'name': rental.name,
+        'city': rental.city,
+        'rating': rental.rating,
+        'total_reviews': rental.total_reviews,
+        'profile_picture': rental.profile_picture,
+        **rental.vehicle_summary,
+        'vehicles': [{
+            'id': vehicle.id,
+            'make': vehicle.make,
+            'model': vehicle.model,
+            'vehicle_type': vehicle.vehicle_type,
+            'transmission': vehicle.transmission,
+            'fuel_type': vehicle.fuel_type,
+            'price_per_day': vehicle.price_per_day
+        } for vehicle in rental.matching_vehicles]
+    }
+
+@app.route('/vehicle-rentals')
+def vehicle_rentals():
+    """Vehicle rentals listing page"""
+    # Get search and filter parameters
+    filters = vehicle_rental_args()
+    cursor = request.args.get('cursor')
     
-    rentals = query.all()
+    rentals, next_cursor = vehicle_rental_page(filters, cursor, page_size(request.args.get('limit', type=int)))
+    total_rentals = vehicle_rental_query(filters)[0].order_by(None).count()
     
-    # Get available vehicles for each rental and apply vehicle-level filters
-    filtered_rentals = []
-    for rental in rentals:
-        vehicle_query = Vehicle.query.filter_by(
-            rental_company_id=rental.id,
-            is_active=True
-        )
-        
-        # Apply vehicle-level filters
-        if vehicle_type:
-            vehicle_query = vehicle_query.filter_by(vehicle_type=vehicle_type)
-        if transmission:
-            vehicle_query = vehicle_query.filter_by(transmission=transmission)
-        if fuel_type:
-            vehicle_query = vehicle_query.filter_by(fuel_type=fuel_type)
-        if min_price:
-            vehicle_query = vehicle_query.filter(Vehicle.price_per_day >= min_price)
-        if max_price:
-            vehicle_query = vehicle_query.filter(Vehicle.price_per_day <= max_price)
-        
-        available_vehicles = vehicle_query.all()
-        
-        # Only include rental if it has vehicles matching the filters
-        if available_vehicles:
-            rental.vehicles = available_vehicles
-            filtered_rentals.append(rental)
+    # Keyset paging links carry the current filters plus the cursor
+    page_args = request.args.to_dict(flat=False)
+    page_args.pop('cursor', None)
+    first_page_url = url_for('vehicle_rentals', **page_args) if cursor else None
+    next_page_url = url_for('vehicle_rentals', cursor=next_cursor, **page_args) if next_cursor else None
     
     # Get cities for filter dropdown
     cities = db.session.query(VehicleRental.city).filter_by(is_approved=True).distinct().all()
     cities = [city[0] for city in cities if city[0]]
     
     return render_template('vehicle_rentals.html', 
-                         rentals=filtered_rentals,
-                         search=search,
-                         city=city,
-                         min_price=min_price,
-                         max_price=max_price,
-                         vehicle_type=vehicle_type,
-                         transmission=transmission,
-                         fuel_type=fuel_type,
-                         sort_by=sort_by,
-                         sort_order=sort_order,
+                         rentals=rentals,
+                         total_rentals=total_rentals,
+                         next_page_url=next_page_url,
+                         first_page_url=first_page_url,
+                         search=filters['search'],
+                         city=filters['city'],
+                         min_price=filters['min_price'],
+                         max_price=filters['max_price'],
+                         vehicle_type=filters['vehicle_type'],
+                         transmission=filters['transmission'],
+                         fuel_type=filters['fuel_type'],
+                         all_features=list(amenity_counts(Vehicle)),
+                         selected_features=filters['features'],
+                         sort_by=filters['sort_by'],
+                         sort_order=filters['sort_order'],
                          cities=cities)
 
+@app.route('/api/vehicle-rentals')
+def api_vehicle_rentals():
+    """JSON vehicle rental listing with the /vehicle-rentals filters and keyset pagination.
+
+    Pass stream=1 to receive every match as one streamed JSON document
+    instead of a single page.
+    """
+    filters = vehicle_rental_args()
+    
+    if request.args.get('stream') == '1':
+        def fetch_page(cursor):
+            return vehicle_rental_page(filters, cursor, MAX_PAGE_SIZE)
+        
+        return Response(stream_with_context(stream_json_array('rentals', fetch_page, serialize_vehicle_rental, {'success': True})),
+                        mimetype='application/json')
+    
+    rentals, next_cursor = vehicle_rental_page(filters, request.args.get('cursor'),
+                                               page_size(request.args.get('limit', type=int)))
+    return jsonify({
+        'success': True,
+        'rentals': [serialize_vehicle_rental(rental) for rental in rentals],
+        'next_cursor': next_cursor
+    })
+
 @app.route('/vehicle-rental/<int:rental_id>')
 def vehicle_rental_detail(rental_id):
     """Vehicle rental detail page"""
@@ -3696,7 +4100,7 @@ def vehicle_rental_detail(rental_id):
     available_vehicles = Vehicle.query.filter_by(
         rental_company_id=rental_id,
         is_active=True
-    ).all()
+    ).options(selectinload(Vehicle.feature_items)).all()
     
     # Get pickup and return dates from query parameters
     pickup_date = request.args.get('pickup_date')
@@ -3706,7 +4110,8 @@ def vehicle_rental_detail(rental_id):
                          rental=rental,
                          vehicles=available_vehicles,
                          pickup_date=pickup_date,
-                         return_date=return_date)
+                         return_date=return_date,
+                         max_calendar_days=MAX_CALENDAR_DAYS)
 
 @app.route('/book-vehicle/<int:vehicle_id>', methods=['GET', 'POST'])
 @login_required
@@ -3746,27 +4151,11 @@ def book_vehicle(vehicle_id):
         
         total_amount = vehicle.price_per_day * days
         
-        # Check vehicle availability
-        overlapping_bookings = VehicleBooking.query.filter(
-            VehicleBooking.vehicle_id == vehicle_id,
-            VehicleBooking.status.in_(['pending', 'confirmed']),
-            or_(
-                and_(
-                    VehicleBooking.pickup_date <= pickup_date,
-                    VehicleBooking.return_date > pickup_date
-                ),
-                and_(
-                    VehicleBooking.pickup_date < return_date,
-                    VehicleBooking.return_date >= return_date
-                ),
-                and_(
-                    VehicleBooking.pickup_date >= pickup_date,
-                    VehicleBooking.return_date <= return_date
-                )
-            )
-        ).count()
+        # Hold the vehicle row so concurrent bookings of this vehicle count one after another
+        lock_for_booking(Vehicle, vehicle.id)
         
-        if overlapping_bookings >= vehicle.available_vehicles:
+        # Check vehicle availability against live bookings
+        if fleet_inventory.live_free_units(vehicle, pickup_date, return_date) < 1:
             flash('Vehicle not available for selected dates', 'error')
             return render_template('book_vehicle.html', vehicle=vehicle, rental=rental)
         
@@ -3789,7 +4178,17 @@ def book_vehicle(vehicle_id):
         )
         
         db.session.add(booking)
+        db.session.flush()
+        
+        # Count again including this booking; on SQLite, which ignores the row lock, this is what stops two
+        # workers taking the last unit
+        if fleet_inventory.overbooked(vehicle, pickup_date, return_date):
+            db.session.rollback()
+            flash('Vehicle not available for selected dates', 'error')
+            return render_template('book_vehicle.html', vehicle=vehicle, rental=rental)
+        
         db.session.commit()
+        fleet_inventory.record_booking(booking)
         
         flash('Vehicle booked successfully!', 'success')
         return redirect(url_for('vehicle_booking_confirmation', booking_id=booking.id))
@@ -4023,21 +4422,46 @@ def vehicle_rental_dashboard():
     # Get user's rental companies
     rentals = VehicleRental.query.filter_by(owner_id=current_user.id).all()
     
-    # Get vehicles count for all rentals
-    vehicles_count = 0
-    for rental in rentals:
-        vehicles_count += Vehicle.query.filter_by(rental_company_id=rental.id).count()
-    
-    # Get bookings for all rentals
-    all_bookings = []
-    for rental in rentals:
-        bookings = VehicleBooking.query.filter_by(rental_company_id=rental.id).order_by(VehicleBooking.created_at.desc()).all()
-        all_bookings.extend(bookings)
+    # Grouped fleet figures plus one page of bookings ordered across all companies
+    stats = vehicle_owner_summary(current_user.id)
+    cursor = request.args.get('cursor')
+    bookings, next_cursor = vehicle_owner_bookings(current_user.id, cursor, DASHBOARD_BOOKINGS_PAGE_SIZE)
     
     return render_template('vehicle_rental_dashboard.html', 
                          rentals=rentals, 
-                         bookings=all_bookings,
-                         vehicles_count=vehicles_count)
+                         bookings=bookings,
+                         stats=stats,
+                         vehicles_count=stats['vehicles_count'],
+                         next_page_url=url_for('vehicle_rental_dashboard', cursor=next_cursor) if next_cursor else None,
+                         first_page_url=url_for('vehicle_rental_dashboard') if cursor else None)
+
+@app.route('/vehicle-rental-dashboard/data')
+@login_required
+def vehicle_rental_dashboard_data():
+    """Vehicle rental dashboard figures and one page of bookings as JSON"""
+    if current_user.role != 'vehicle_rental':
+        return jsonify({'error': 'Access denied'}), 403
+    
+    stats = vehicle_owner_summary(current_user.id)
+    bookings, next_cursor = vehicle_owner_bookings(current_user.id, request.args.get('cursor'),
+                                                   page_size(request.args.get('limit', type=int)))
+    return jsonify({
+        'success': True,
+        'stats': {**stats, 'companies': {str(rental_id): figures for rental_id, figures in stats['companies'].items()}},
+        'bookings': [{
+            'id': booking.id,
+            'booking_reference': booking.booking_reference,
+            'rental_company_id': booking.rental_company_id,
+            'vehicle': f'{booking.vehicle.make} {booking.vehicle.model}',
+            'customer': f'{booking.user.first_name} {booking.user.last_name}',
+            'pickup_date': booking.pickup_date.isoformat(),
+            'return_date': booking.return_date.isoformat(),
+            'total_amount': booking.total_amount,
+            'status': booking.status,
+            'created_at': booking.created_at.isoformat() if booking.created_at else None
+        } for booking in bookings],
+        'next_cursor': next_cursor
+    })
 
 @app.route('/add-vehicle/<int:rental_id>', methods=['GET', 'POST'])
 @login_required
@@ -4095,13 +4519,13 @@ def add_vehicle(rental_id):
             seating_capacity=seating_capacity,
             luggage_capacity=luggage_capacity,
             mileage=mileage,
-            features=json.dumps(features),
             price_per_day=price_per_day,
             price_per_hour=price_per_hour,
             total_vehicles=total_vehicles,
             available_vehicles=total_vehicles,
             images=json.dumps([vehicle_image]) if vehicle_image else None
         )
+        set_amenities(vehicle, features)
         
         db.session.add(vehicle)
         db.session.commit()
@@ -4130,7 +4554,7 @@ def view_vehicles():
     # Get all vehicles for all rentals
     all_vehicles = []
     for rental in rentals:
-        vehicles = Vehicle.query.filter_by(rental_company_id=rental.id).all()
+        vehicles = Vehicle.query.filter_by(rental_company_id=rental.id).options(selectinload(Vehicle.feature_items)).all()
         for vehicle in vehicles:
             vehicle.rental_company = rental  # Add rental company info to vehicle
             all_vehicles.append(vehicle)
@@ -4168,7 +4592,7 @@ def edit_vehicle(vehicle_id):
         vehicle.seating_capacity = int(request.form['seating_capacity'])
         vehicle.luggage_capacity = request.form.get('luggage_capacity', '').strip()
         vehicle.mileage = request.form.get('mileage', '').strip()
-        vehicle.features = json.dumps(request.form.getlist('features'))
+        set_amenities(vehicle, request.form.getlist('features'))
         vehicle.price_per_day = float(request.form['price_per_day'])
         vehicle.price_per_hour = float(request.form.get('price_per_hour', 0)) or None
         vehicle.total_vehicles = int(request.form['total_vehicles'])
@@ -4193,9 +4617,7 @@ def edit_vehicle(vehicle_id):
         return redirect(url_for('view_vehicles'))
     
     # Parse features for display
-    features_list = []
-    if vehicle.features:
-        features_list = json.loads(vehicle.features)
+    features_list = vehicle.feature_names
     
     return render_template('edit_vehicle.html', vehicle=vehicle, rental=rental, features_list=features_list)
 
@@ -4230,8 +4652,11 @@ def reject_vehicle_booking(booking_id):
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
+    was_live = booking.status in LIVE_BOOKING_STATUSES
     booking.status = 'cancelled'
     db.session.commit()
+    if was_live:
+        fleet_inventory.release_booking(booking)
     
     flash('Vehicle booking rejected successfully!', 'success')
     return redirect(url_for('vehicle_rental_dashboard'))
@@ -4248,8 +4673,11 @@ def complete_vehicle_booking(booking_id):
         flash('Access denied!', 'error')
         return redirect(url_for('index'))
     
+    was_live = booking.status in LIVE_BOOKING_STATUSES
     booking.status = 'completed'
     db.session.commit()
+    if was_live:
+        fleet_inventory.release_booking(booking)
     
     flash('Vehicle booking marked as completed!', 'success')
     return redirect(url_for('vehicle_rental_dashboard'))
@@ -4265,8 +4693,7 @@ def api_translate():
 
     # If source is "auto", let Google auto-detect by passing 'auto' directly
     if source == "auto":
-        target_code = get_lang_code(target)
-        translated = GoogleTranslator(source="auto", target=target_code).translate(text)
+        translated = translate_codes(text, "auto", get_lang_code(target))
     else:
         translated = translate_text(text, source, target)
 
@@ -4275,6 +4702,75 @@ def api_translate():
         "translated": translated,
     })
 
+@app.route('/api/translate/batch', methods=['POST'])
+def api_translate_batch():
+    """Translate many texts into many target languages in one call.
+
+    Body: {"texts": [...], "targets": ["hi", "te"], "source": "auto"}. Texts are
+    deduplicated, cache hits are answered directly and only the misses go to the
+    translator, concurrently on a bounded pool, under one BATCH_TIMEOUT_SECONDS
+    deadline. translations[i][j] is texts[i] in targets[j], or null if that
+    translation failed or missed the deadline (see errors).
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    texts = payload.get("texts")
+    targets = payload.get("targets")
+    source = payload.get("source", "auto")
+
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return jsonify({"ok": False, "error": "texts must be a list of strings"}), 400
+    if not isinstance(targets, list) or not targets:
+        return jsonify({"ok": False, "error": "targets must be a non-empty list of languages"}), 400
+    if len(texts) > MAX_BATCH_TEXTS or len(targets) > MAX_BATCH_TARGETS:
+        return jsonify({"ok": False, "error": f"At most {MAX_BATCH_TEXTS} texts and {MAX_BATCH_TARGETS} targets per batch"}), 400
+    try:
+        source_code = "auto" if source == "auto" else get_lang_code(source)
+        target_codes = [get_lang_code(target) for target in targets]
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    # One job per distinct (normalized text, target) pair
+    unique_texts = sorted({' '.join(text.split()) for text in texts} - {''})
+    results = {}
+    pending = {}
+    for text in unique_texts:
+        for target_code in set(target_codes):
+            cached = translation_cache.get(text, source_code, target_code)
+            if cached is not None:
+                results[(text, target_code)] = cached
+            else:
+                pending[(text, target_code)] = translation_executor.submit(translate_and_cache, text, source_code, target_code)
+
+    # One deadline for the whole batch; jobs still queued after it are cancelled so they free the pool
+    done, _ = wait(pending.values(), timeout=BATCH_TIMEOUT_SECONDS)
+    errors = []
+    for (text, target_code), future in pending.items():
+        if future not in done:
+            future.cancel()
+            results[(text, target_code)] = None
+            errors.append({"text": text, "target": target_code, "error": "Timed out"})
+            continue
+        try:
+            results[(text, target_code)] = future.result()
+        except Exception as e:
+            results[(text, target_code)] = None
+            errors.append({"text": text, "target": target_code, "error": str(e)})
+
+    translations = []
+    for text in texts:
+        normalized = ' '.join(text.split())
+        translations.append([results.get((normalized, code), "") if normalized else "" for code in target_codes])
+
+    return jsonify({
+        "ok": not errors,
+        "source": source,
+        "targets": targets,
+        "translations": translations,
+        "cache_hits": sum(1 for key in results if key not in pending),
+        "translated": len(pending) - len(errors),
+        "errors": errors
+    })
+
 @app.route('/api/tts', methods=['POST'])
 def api_tts():
     """Convert text to speech"""
@@ -4287,9 +4783,8 @@ def api_tts():
         return jsonify({"ok": False, "error": "Missing text"}), 400
 
     try:
-        audio_bytes = synthesize_speech(text=text, lang_key=lang, voice=voice)
-        b64_audio = base64.b64encode(audio_bytes).decode("ascii")
-        return jsonify({"ok": True, "audio_base64": b64_audio, "mime": "audio/mpeg"})
+        key = cached_speech_key(text=text, lang_key=lang, voice=voice)
+        return jsonify({"ok": True, "audio_url": url_for('tts_audio', key=key), "mime": "audio/mpeg"})
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
@@ -4307,17 +4802,56 @@ def api_translate_tts():
 
     try:
         translated = translate_text(text, source, target)
-        audio_bytes = synthesize_speech(text=translated, lang_key=target, voice=voice)
-        b64_audio = base64.b64encode(audio_bytes).decode("ascii")
+        key = cached_speech_key(text=translated, lang_key=target, voice=voice)
         return jsonify({
             "ok": True,
             "translated": translated,
-            "audio_base64": b64_audio,
+            "audio_url": url_for('tts_audio', key=key),
             "mime": "audio/mpeg",
         })
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
+@app.route('/api/tts/stream', methods=['GET', 'POST'])
+def api_tts_stream():
+    """Speech for text as a chunked audio/mpeg stream, so playback starts with the first chunk.
+
+    Accepts text/lang/voice as query parameters (usable as an <audio> src) or a
+    JSON body. Query strings are bounded by the server's request-line limit
+    (4094 bytes under Gunicorn), so long texts such as blog read-alouds must be
+    POSTed; the translator page does this automatically. Clips already in the
+    audio cache are redirected to their file.
+    """
+    payload = (request.get_json(force=True, silent=True) or {}) if request.method == 'POST' else request.args
+    text = ' '.join((payload.get("text") or "").split())
+    lang = payload.get("lang", "en")
+    voice = payload.get("voice")
+
+    if not text:
+        return jsonify({"ok": False, "error": "Missing text"}), 400
+    if len(text) > MAX_TTS_STREAM_CHARS:
+        return jsonify({"ok": False, "error": f"Text is longer than {MAX_TTS_STREAM_CHARS} characters"}), 413
+    try:
+        selected_voice = get_voice(lang, voice)
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    key = audio_key(text, selected_voice, TTS_RATE, TTS_VOLUME)
+    if audio_cache.has(key):
+        return redirect(url_for('tts_audio', key=key), code=303)
+    return Response(stream_with_context(stream_cached_speech(text, lang, selected_voice, key)),
+                    mimetype='audio/mpeg', headers={'Cache-Control': 'no-store', 'X-Audio-Key': key})
+
+@app.route('/api/tts/audio/<key>.mp3')
+def tts_audio(key):
+    """Serve a cached clip; clips never change, so they carry their key as ETag and support Range requests"""
+    if not re.fullmatch(r'[0-9a-f]{64}', key):
+        abort(404)
+    path = audio_cache.path(key)
+    if not os.path.exists(path):
+        abort(404)
+    return send_file(path, mimetype='audio/mpeg', conditional=True, etag=key, max_age=365 * 24 * 3600)
+
 @app.route('/translator')
 def translator():
     """Language translator page"""
@@ -4696,6 +5230,17 @@ def chatbot_create_hotel_booking():
         if not all([hotel_id, room_type_id, guests, rooms, total_amount]):
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
+        room_type = RoomType.query.filter_by(id=room_type_id, hotel_id=hotel_id).first()
+        if not room_type:
+            return jsonify({'success': False, 'error': 'Room type not found'}), 404
+        
+        check_in = datetime.now().date()
+        check_out = check_in + timedelta(days=1)
+        
+        # Reserve the night in the availability calendar
+        if not reserve_room_nights(room_type, check_in, check_out, int(rooms)):
+            return jsonify({'success': False, 'error': 'Not enough rooms available for the selected dates'}), 409
+        
         # Generate booking reference
         booking_reference = f"HTL{datetime.now().strftime('%Y%m%d%H%M%S')}{current_user.id}"
         
@@ -4704,8 +5249,8 @@ def chatbot_create_hotel_booking():
             user_id=current_user.id,
             hotel_id=hotel_id,
             room_type_id=room_type_id,
-            check_in=datetime.now().date(),
-            check_out=datetime.now().date() + timedelta(days=1),
+            check_in=check_in,
+            check_out=check_out,
             guests=guests,
             rooms=rooms,
             total_amount=total_amount,
@@ -4715,6 +5260,7 @@ def chatbot_create_hotel_booking():
         
         db.session.add(booking)
         db.session.commit()
+        room_inventory.record_booking(booking)
         
         return jsonify({
             'success': True,
@@ -4747,6 +5293,22 @@ def chatbot_create_vehicle_booking():
         if not all([vehicle_id, rental_company_id, pickup_date, return_date, total_amount]):
             return jsonify({'success': False, 'error': 'Missing required fields'}), 400
         
+        vehicle = Vehicle.query.filter_by(id=vehicle_id, rental_company_id=rental_company_id).first()
+        if not vehicle:
+            return jsonify({'success': False, 'error': 'Vehicle not found'}), 404
+        
+        pickup_date = datetime.strptime(pickup_date, '%Y-%m-%d').date()
+        return_date = datetime.strptime(return_date, '%Y-%m-%d').date()
+        if pickup_date >= return_date:
+            return jsonify({'success': False, 'error': 'Return date must be after pickup date'}), 400
+        
+        # Hold the vehicle row so concurrent bookings of this vehicle count one after another
+        lock_for_booking(Vehicle, vehicle.id)
+        
+        # Check vehicle availability against live bookings
+        if fleet_inventory.live_free_units(vehicle, pickup_date, return_date) < 1:
+            return jsonify({'success': False, 'error': 'Vehicle not available for selected dates'}), 409
+        
         # Generate booking reference
         booking_reference = f"VHC{datetime.now().strftime('%Y%m%d%H%M%S')}{current_user.id}"
         
@@ -4755,8 +5317,8 @@ def chatbot_create_vehicle_booking():
             user_id=current_user.id,
             rental_company_id=rental_company_id,
             vehicle_id=vehicle_id,
-            pickup_date=datetime.strptime(pickup_date, '%Y-%m-%d').date(),
-            return_date=datetime.strptime(return_date, '%Y-%m-%d').date(),
+            pickup_date=pickup_date,
+            return_date=return_date,
             pickup_time=datetime.strptime('10:00', '%H:%M').time(),
             return_time=datetime.strptime('18:00', '%H:%M').time(),
             pickup_location='Chatbot Booking',
@@ -4769,7 +5331,16 @@ def chatbot_create_vehicle_booking():
         )
         
         db.session.add(booking)
+        db.session.flush()
+        
+        # Count again including this booking; on SQLite, which ignores the row lock, this is what stops two
+        # workers taking the last unit
+        if fleet_inventory.overbooked(vehicle, pickup_date, return_date):
+            db.session.rollback()
+            return jsonify({'success': False, 'error': 'Vehicle not available for selected dates'}), 409
+        
         db.session.commit()
+        fleet_inventory.record_booking(booking)
         
         return jsonify({
             'success': True,
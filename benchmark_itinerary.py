@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the itinerary and geo helpers.
+
+Times haversine, EnhancedRealTimeModel.calculate_distance,
+get_places_by_interests, optimize_itinerary_by_travel_time, mood_based_filter
+and estimate_transport_modes against synthetic cities of 10, 1k and 100k places,
+so the cost of itinerary generation can be tracked as the place database grows.
+
+    python benchmark_itinerary.py
+    python benchmark_itinerary.py --sizes 10,1000 --json itinerary_bench.json
+
+Each case is calibrated to run for at least --min-time seconds per round; the
+table reports min / mean / stddev per call over --rounds rounds.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import haversine, mood_based_filter, estimate_transport_modes
+from enhanced_realtime_model import EnhancedRealTimeModel
+
+# Synthetic city registered in the model's place database
+BENCH_CITY = 'benchcity'
+CITY_CENTER = (17.6869, 83.2181)
+
+CATEGORIES = ['culture', 'history', 'education', 'nature', 'photography', 'adventure', 'family',
+              'food', 'local_cuisine', 'shopping', 'market', 'entertainment', 'spiritual', 'temple']
+NAME_WORDS = ['Beach', 'Garden', 'Valley', 'Park', 'Lake', 'Hill', 'Fort', 'Museum', 'Cave', 'Trail',
+              'Temple', 'City Palace', 'Market', 'Gallery', 'Tower', 'Bazaar']
+INTERESTS = ['culture', 'nature', 'adventure']
+
+
+def make_places(count, rng):
+    """A synthetic city's places keyed by id, scattered within ~50 km of the centre"""
+    places = {}
+    for i in range(count):
+        places[f'place_{i}'] = {
+            'name': f'{rng.choice(["Old", "New", "Royal", "Hidden", "Grand"])} {rng.choice(NAME_WORDS)} {i}',
+            'address': f'{i} Synthetic Road, Bench City',
+            'coordinates': (CITY_CENTER[0] + rng.uniform(-0.45, 0.45), CITY_CENTER[1] + rng.uniform(-0.45, 0.45)),
+            'categories': rng.sample(CATEGORIES, rng.randint(1, 3)),
+            'duration': rng.randint(10, 120),
+            'cost': rng.randint(0, 500),
+            'rating': round(rng.uniform(3.0, 5.0), 1)
+        }
+    return places
+
+
+def time_case(func, min_time, rounds):
+    """Per-call timings (seconds) over `rounds` rounds, each long enough to be measurable"""
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or iterations >= 1_000_000:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(10, math.ceil(min_time / elapsed)))
+
+    samples = [elapsed / iterations]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - started) / iterations)
+    return samples, iterations
+
+
+def build_cases(sizes, rng):
+    """(group, name, size, callable) for every helper and dataset size"""
+    model = EnhancedRealTimeModel()
+    points = [(CITY_CENTER[0] + rng.uniform(-1, 1), CITY_CENTER[1] + rng.uniform(-1, 1)) for _ in range(1000)]
+    pairs = list(zip(points, reversed(points)))
+
+    def all_pairs(distance):
+        return lambda: [distance(a, b) for a, b in pairs]
+
+    cases = [
+        ('geo', 'haversine x1000', 1000, all_pairs(haversine)),
+        ('geo', 'calculate_distance x1000', 1000, all_pairs(model.calculate_distance)),
+        ('transport', 'estimate_transport_modes', 1, lambda: estimate_transport_modes(850.0)),
+    ]
+
+    for size in sizes:
+        model.place_database[BENCH_CITY] = make_places(size, rng)
+        city_places = model.place_database[BENCH_CITY]
+        candidates = model.get_places_by_interests(BENCH_CITY, INTERESTS)
+        names = [place['name'] for place in city_places.values()]
+
+        def interests(places=city_places):
+            model.place_database[BENCH_CITY] = places
+            return model.get_places_by_interests(BENCH_CITY, INTERESTS)
+
+        def optimize(candidates=candidates):
+            # The helper prints a line per place; keep terminal I/O out of the measurement
+            with contextlib.redirect_stdout(io.StringIO()):
+                return model.optimize_itinerary_by_travel_time(list(candidates), 'City Centre', 8 * 60, 'relaxed')
+
+        cases += [
+            ('itinerary', 'get_places_by_interests', size, interests),
+            ('itinerary', 'optimize_itinerary_by_travel_time', size, optimize),
+            ('itinerary', 'mood_based_filter relaxed', size, lambda names=names: mood_based_filter(names, 'relaxed')),
+            ('itinerary', 'mood_based_filter adventurous', size, lambda names=names: mood_based_filter(names, 'adventurous')),
+        ]
+    return cases
+
+
+def format_duration(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for the itinerary and geo helpers')
+    parser.add_argument('--sizes', default='10,1000,100000', help='comma-separated synthetic city sizes')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per round')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    print(f"🔄 Benchmarking itinerary helpers on {', '.join(str(size) for size in sizes)} places...")
+    print(f"{'case':<40} {'places':>8} {'min':>12} {'mean':>12} {'stddev':>12} {'ops/s':>12}")
+
+    results = []
+    for group, name, size, func in build_cases(sizes, rng):
+        samples, iterations = time_case(func, args.min_time, args.rounds)
+        result = {
+            'group': group,
+            'name': name,
+            'size': size,
+            'iterations': iterations,
+            'rounds': args.rounds,
+            'min_s': min(samples),
+            'mean_s': statistics.mean(samples),
+            'stddev_s': statistics.stdev(samples) if len(samples) > 1 else 0.0
+        }
+        result['ops_per_s'] = 1 / result['mean_s'] if result['mean_s'] else None
+        results.append(result)
+        print(f"{name:<40} {size:>8} {format_duration(result['min_s']):>12} {format_duration(result['mean_s']):>12} "
+              f"{format_duration(result['stddev_s']):>12} {result['ops_per_s'] or 0:>12.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as output_file:
+            json.dump({
+                'generated_at': datetime.utcnow().isoformat(),
+                'python': platform.python_version(),
+                'seed': args.seed,
+                'results': results
+            }, output_file, indent=2)
+        print(f"\n🎉 Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Load-test script for the core TourismHub routes.
+
+Seeds a synthetic database (hotels, room types, calendar, bookings, reviews,
+rental companies, vehicles and vehicle bookings), then drives the listing,
+detail, availability and dashboard routes through the Flask test client and
+writes a JSON report of throughput, latency percentiles and SQL queries per
+request. External services are stubbed so runs are offline and repeatable.
+
+    python benchmark_routes.py --hotels 500 --output before.json
+    python benchmark_routes.py --hotels 500 --output after.json --compare before.json
+
+The database is a fresh SQLite file by default. --database points it at
+another database (e.g. a Postgres URL) instead; every table in it is dropped,
+so it is refused unless --i-know-this-drops-tables is passed as well.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as clock, timedelta
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+CITIES = ['Delhi', 'Mumbai', 'Bengaluru', 'Hyderabad', 'Chennai', 'Kolkata', 'Jaipur', 'Goa', 'Pune', 'Kochi']
+HOTEL_CATEGORIES = ['Budget', 'Standard', 'Deluxe', 'Luxury', 'Resort', 'Boutique']
+HOTEL_AMENITIES = ['WiFi', 'Pool', 'Parking', 'Spa', 'Gym', 'Restaurant', 'Bar', 'Room Service', 'Airport Shuttle']
+ROOM_TYPE_NAMES = ['Standard Room', 'Deluxe Room', 'Suite', 'Family Room', 'Executive Room']
+VEHICLE_MODELS = [('Toyota', 'Innova', 'suv'), ('Honda', 'City', 'sedan'), ('Maruti', 'Swift', 'hatchback'),
+                  ('Hyundai', 'Creta', 'suv'), ('Mahindra', 'Thar', 'suv'), ('BMW', '5 Series', 'luxury')]
+VEHICLE_FEATURES = ['GPS', 'Air Conditioning', 'Bluetooth', 'Child Seat', 'Roof Rack', 'Dash Cam']
+BOOKING_STATUSES = ['pending', 'confirmed', 'completed', 'completed', 'cancelled']
+
+# Nights of room calendar seeded per room type
+CALENDAR_DAYS = 120
+
+# Percentiles reported for every route
+PERCENTILES = (50, 90, 95, 99)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Seed a synthetic database and benchmark core routes')
+    parser.add_argument('--database', help='SQLAlchemy URL of a scratch database (default: temporary SQLite file)')
+    parser.add_argument('--i-know-this-drops-tables', dest='allow_drop', action='store_true',
+                        help='confirm that every table in --database may be dropped')
+    parser.add_argument('--hotels', type=int, default=200)
+    parser.add_argument('--room-types', type=int, default=3, help='room types per hotel')
+    parser.add_argument('--users', type=int, default=300)
+    parser.add_argument('--bookings', type=int, default=5000)
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--rentals', type=int, default=50)
+    parser.add_argument('--vehicles', type=int, default=5, help='vehicles per rental company')
+    parser.add_argument('--vehicle-bookings', type=int, default=2000)
+    parser.add_argument('--owner-share', type=int, default=10, help='hotels / rental companies per owner account')
+    parser.add_argument('--requests', type=int, default=50, help='measured requests per route')
+    parser.add_argument('--warmup', type=int, default=3, help='unmeasured requests per route')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_report.json')
+    parser.add_argument('--compare', help='earlier report to print latency and query deltas against')
+    return parser.parse_args()
+
+
+def stub_external_services(app_module):
+    """Make every outbound integration fail fast instead of touching the network"""
+    import requests
+
+    def offline(*args, **kwargs):
+        raise RuntimeError('External services are disabled during benchmarks')
+
+    requests.get = offline
+    requests.post = offline
+    app_module.translate_text = lambda text, source, target: text
+    app_module.get_location_blog_info = lambda location: ''
+
+
+def seed_database(db, models, args, rng):
+    """Fill an empty database with a synthetic dataset; returns ids used to build request URLs"""
+    from sqlalchemy import insert
+    from room_calendar import insert_nights
+    from ratings import repair_rating_aggregates
+
+    User, Hotel, RoomType, Booking, Review = models['User'], models['Hotel'], models['RoomType'], models['Booking'], models['Review']
+    VehicleRental, Vehicle, VehicleBooking = models['VehicleRental'], models['Vehicle'], models['VehicleBooking']
+    today = date.today()
+    now = datetime.utcnow()
+
+    def owner_count(items):
+        return max(1, -(-items // args.owner_share))
+
+    hotel_owners = owner_count(args.hotels)
+    rental_owners = owner_count(args.rentals)
+
+    # Accounts: travellers, hotel owners, rental owners and the superadmin
+    users = [{'username': f'traveller{i}', 'email': f'traveller{i}@example.com', 'password_hash': 'benchmark',
+              'first_name': 'Traveller', 'last_name': str(i), 'role': 'user', 'profile_completed': True}
+             for i in range(args.users)]
+    users += [{'username': f'hotelowner{i}', 'email': f'hotelowner{i}@example.com', 'password_hash': 'benchmark',
+               'first_name': 'Hotel', 'last_name': f'Owner {i}', 'role': 'hotel', 'profile_completed': True}
+              for i in range(hotel_owners)]
+    users += [{'username': f'rentalowner{i}', 'email': f'rentalowner{i}@example.com', 'password_hash': 'benchmark',
+               'first_name': 'Rental', 'last_name': f'Owner {i}', 'role': 'vehicle_rental', 'profile_completed': True}
+              for i in range(rental_owners)]
+    users.append({'username': 'superadmin', 'email': 'admin@tourism.com', 'password_hash': 'admin123',
+                  'first_name': 'Super', 'last_name': 'Admin', 'role': 'superadmin', 'profile_completed': True})
+    db.session.execute(insert(User), users)
+
+    ids = {role: [] for role in ('user', 'hotel', 'vehicle_rental', 'superadmin')}
+    for user_id, role in db.session.query(User.id, User.role).order_by(User.id):
+        ids[role].append(user_id)
+    traveller_ids = ids['user']
+
+    # Hotels and room types
+    hotels = []
+    for i in range(args.hotels):
+        amenities = rng.sample(HOTEL_AMENITIES, rng.randint(2, 6))
+        rooms = rng.randint(10, 120)
+        hotels.append({
+            'name': f'{rng.choice(["Grand", "Royal", "Sea View", "Heritage", "City"])} Hotel {i}',
+            'description': f'Synthetic benchmark hotel {i} with {", ".join(amenities)}',
+            'address': f'{i} Benchmark Road', 'city': rng.choice(CITIES), 'state': 'State', 'country': 'India',
+            'phone': '0000000000', 'email': f'hotel{i}@example.com', 'category': rng.choice(HOTEL_CATEGORIES),
+            'amenities': json.dumps(amenities), 'price_per_night': round(rng.uniform(800, 15000), 2),
+            'total_rooms': rooms, 'available_rooms': rooms, 'is_approved': rng.random() < 0.95,
+            'owner_id': ids['hotel'][i // args.owner_share], 'rating': 0.0, 'total_reviews': 0, 'rating_sum': 0
+        })
+    db.session.execute(insert(Hotel), hotels)
+    hotel_rows = db.session.query(Hotel.id, Hotel.price_per_night).order_by(Hotel.id).all()
+
+    room_types = []
+    for hotel_id, price in hotel_rows:
+        for name in ROOM_TYPE_NAMES[:args.room_types]:
+            room_types.append({
+                'hotel_id': hotel_id, 'name': name, 'max_occupancy': rng.randint(2, 5),
+                'price_per_night': round(price * rng.uniform(0.8, 2.0), 2), 'total_rooms': rng.randint(5, 40),
+                'amenities': json.dumps(rng.sample(HOTEL_AMENITIES, 2)), 'is_active': True
+            })
+    db.session.execute(insert(RoomType), room_types)
+    room_type_rows = RoomType.query.order_by(RoomType.id).all()
+
+    # Hotel bookings; live bookings are reflected in the room calendar
+    bookings = []
+    booked_nights = {}
+    for _ in range(args.bookings):
+        room_type = rng.choice(room_type_rows)
+        check_in = today + timedelta(days=rng.randint(-180, CALENDAR_DAYS - 10))
+        check_out = check_in + timedelta(days=rng.randint(1, 7))
+        rooms = rng.randint(1, 2)
+        status = rng.choice(BOOKING_STATUSES)
+        if status in ('pending', 'confirmed') and check_out > today:
+            per_night = booked_nights.setdefault(room_type.id, {})
+            night = max(check_in, today)
+            while night < min(check_out, today + timedelta(days=CALENDAR_DAYS)):
+                if per_night.get(night, 0) + rooms > room_type.total_rooms:
+                    status = 'cancelled'
+                    break
+                night += timedelta(days=1)
+            if status != 'cancelled':
+                night = max(check_in, today)
+                while night < min(check_out, today + timedelta(days=CALENDAR_DAYS)):
+                    per_night[night] = per_night.get(night, 0) + rooms
+                    night += timedelta(days=1)
+        bookings.append({
+            'user_id': rng.choice(traveller_ids), 'hotel_id': room_type.hotel_id, 'room_type_id': room_type.id,
+            'check_in': check_in, 'check_out': check_out, 'rooms': rooms, 'guests': rooms * 2,
+            'total_amount': round(room_type.price_per_night * rooms * (check_out - check_in).days, 2),
+            'status': status, 'payment_status': 'paid' if status == 'completed' else 'pending',
+            'created_at': now - timedelta(minutes=rng.randint(0, 500000))
+        })
+    db.session.execute(insert(Booking), sorted(bookings, key=lambda row: row['created_at']))
+
+    for room_type in room_type_rows:
+        insert_nights(room_type, (today + timedelta(days=i) for i in range(CALENDAR_DAYS)),
+                      booked_nights.get(room_type.id))
+
+    # Reviews, newest last so ids follow created_at
+    reviews = [{
+        'user_id': rng.choice(traveller_ids), 'hotel_id': rng.choice(hotel_rows)[0],
+        'rating': rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 6, 8])[0],
+        'title': 'Benchmark stay', 'comment': 'Synthetic review text for load testing.',
+        'is_verified': True, 'created_at': now - timedelta(minutes=rng.randint(0, 500000))
+    } for _ in range(args.reviews)]
+    db.session.execute(insert(Review), sorted(reviews, key=lambda row: row['created_at']))
+
+    # Rental companies, vehicles and vehicle bookings
+    rentals = [{
+        'name': f'Benchmark Rentals {i}', 'description': 'Synthetic benchmark rental company',
+        'address': f'{i} Fleet Street', 'city': rng.choice(CITIES), 'state': 'State', 'country': 'India',
+        'phone': '0000000000', 'email': f'rental{i}@example.com', 'is_approved': rng.random() < 0.95,
+        'owner_id': ids['vehicle_rental'][i // args.owner_share], 'rating': 0.0, 'total_reviews': 0, 'rating_sum': 0
+    } for i in range(args.rentals)]
+    db.session.execute(insert(VehicleRental), rentals)
+    rental_ids = [rental_id for rental_id, in db.session.query(VehicleRental.id).order_by(VehicleRental.id)]
+
+    vehicles = []
+    for rental_id in rental_ids:
+        for _ in range(args.vehicles):
+            make, model, vehicle_type = rng.choice(VEHICLE_MODELS)
+            units = rng.randint(1, 8)
+            vehicles.append({
+                'rental_company_id': rental_id, 'make': make, 'model': model, 'year': rng.randint(2016, 2025),
+                'vehicle_type': vehicle_type, 'transmission': rng.choice(['manual', 'automatic']),
+                'fuel_type': rng.choice(['petrol', 'diesel', 'electric', 'hybrid']),
+                'seating_capacity': rng.choice([4, 5, 7]), 'features': json.dumps(rng.sample(VEHICLE_FEATURES, 3)),
+                'price_per_day': round(rng.uniform(1200, 12000), 2), 'total_vehicles': units,
+                'available_vehicles': units, 'is_active': True
+            })
+    db.session.execute(insert(Vehicle), vehicles)
+    vehicle_rows = db.session.query(Vehicle.id, Vehicle.rental_company_id, Vehicle.price_per_day).order_by(Vehicle.id).all()
+
+    vehicle_bookings = []
+    for _ in range(args.vehicle_bookings):
+        vehicle_id, rental_id, price = rng.choice(vehicle_rows)
+        pickup = today + timedelta(days=rng.randint(-120, 60))
+        days = rng.randint(1, 5)
+        vehicle_bookings.append({
+            'user_id': rng.choice(traveller_ids), 'rental_company_id': rental_id, 'vehicle_id': vehicle_id,
+            'pickup_date': pickup, 'return_date': pickup + timedelta(days=days),
+            'pickup_time': clock(10, 0), 'return_time': clock(10, 0),
+            'pickup_location': 'Airport', 'return_location': 'Airport',
+            'drivers_license': 'BENCH0000', 'drivers_license_expiry': today + timedelta(days=3650),
+            'total_amount': round(price * days, 2), 'status': rng.choice(BOOKING_STATUSES),
+            'created_at': now - timedelta(minutes=rng.randint(0, 500000))
+        })
+    db.session.execute(insert(VehicleBooking), sorted(vehicle_bookings, key=lambda row: row['created_at']))
+
+    repair_rating_aggregates()
+    db.session.commit()
+
+    approved_hotels = [hotel_id for hotel_id, in db.session.query(Hotel.id).filter(Hotel.is_approved == True)]
+    approved = set(approved_hotels)
+    return {
+        'hotel_ids': approved_hotels,
+        'room_type_ids': [room_type.id for room_type in room_type_rows if room_type.hotel_id in approved],
+        'vehicle_ids': [row[0] for row in vehicle_rows],
+        'traveller_id': traveller_ids[0],
+        'hotel_owner_id': ids['hotel'][0],
+        'rental_owner_id': ids['vehicle_rental'][0],
+        'superadmin_id': ids['superadmin'][0]
+    }
+
+
+def build_scenarios(seeded, rng):
+    """Route name -> (user id to log in as or None, callable returning the next URL)"""
+    today = date.today()
+
+    def stay():
+        start = today + timedelta(days=rng.randint(1, 60))
+        return start, start + timedelta(days=rng.randint(1, 7))
+
+    def room_type_availability():
+        check_in, check_out = stay()
+        return (f'/api/room-type-availability/{rng.choice(seeded["room_type_ids"])}'
+                f'?check_in={check_in}&check_out={check_out}')
+
+    def vehicle_availability():
+        pickup, dropoff = stay()
+        return (f'/api/vehicle-availability/{rng.choice(seeded["vehicle_ids"])}'
+                f'?pickup_date={pickup}&return_date={dropoff}')
+
+    return {
+        'hotels': (None, lambda: '/hotels'),
+        'hotels_search': (None, lambda: f'/hotels?city={rng.choice(CITIES)}&sort_by=rating'),
+        'hotel_detail': (None, lambda: f'/hotel/{rng.choice(seeded["hotel_ids"])}'),
+        'room_type_availability': (None, room_type_availability),
+        'vehicle_availability': (None, vehicle_availability),
+        'vehicle_rentals': (None, lambda: '/vehicle-rentals'),
+        'user_dashboard': (seeded['traveller_id'], lambda: '/user/dashboard'),
+        'hotel_dashboard': (seeded['hotel_owner_id'], lambda: '/hotel/dashboard'),
+        'vehicle_rental_dashboard': (seeded['rental_owner_id'], lambda: '/vehicle-rental-dashboard'),
+        'superadmin_dashboard': (seeded['superadmin_id'], lambda: '/superadmin/dashboard'),
+    }
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_route(app, user_id, next_url, requests_count, warmup):
+    """Issue warmup + measured GETs for one route and summarize them"""
+    client = app.test_client()
+    if user_id is not None:
+        with client.session_transaction() as flask_session:
+            flask_session['_user_id'] = str(user_id)
+            flask_session['_fresh'] = True
+
+    for _ in range(warmup):
+        client.get(next_url())
+
+    latencies, queries, status_codes = [], [], {}
+    started = time.perf_counter()
+    for _ in range(requests_count):
+        url = next_url()
+        request_started = time.perf_counter()
+        response = client.get(url)
+        response.get_data()
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+        if 'X-Query-Count' in response.headers:
+            queries.append(int(response.headers['X-Query-Count']))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    summary = {
+        'requests': requests_count,
+        'errors': sum(count for code, count in status_codes.items() if not code.startswith(('2', '3'))),
+        'status_codes': status_codes,
+        'throughput_rps': round(requests_count / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'min': round(latencies[0], 2) if latencies else 0.0,
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        },
+        'queries_per_request': {
+            'mean': round(sum(queries) / len(queries), 2) if queries else None,
+            'max': max(queries) if queries else None
+        }
+    }
+    for pct in PERCENTILES:
+        summary['latency_ms'][f'p{pct}'] = round(percentile(latencies, pct), 2)
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(report, baseline_path):
+    """Print p50/p95 latency and mean query deltas against an earlier report"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    print(f"\n📊 Compared with {baseline_path} (commit {baseline.get('commit')}):")
+    for name, current in report['routes'].items():
+        previous = baseline.get('routes', {}).get(name)
+        if not previous:
+            print(f"   {name:<26} (new route)")
+            continue
+        parts = []
+        for key in ('p50', 'p95'):
+            before, after = previous['latency_ms'][key], current['latency_ms'][key]
+            change = f"{(after - before) / before * 100:+.0f}%" if before else 'n/a'
+            parts.append(f"{key} {before:.1f} -> {after:.1f} ms ({change})")
+        before_queries = previous['queries_per_request']['mean']
+        after_queries = current['queries_per_request']['mean']
+        if before_queries is not None and after_queries is not None:
+            parts.append(f"queries {before_queries:g} -> {after_queries:g}")
+        print(f"   {name:<26} " + ', '.join(parts))
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+
+    database_path = None
+    if args.database and not args.allow_drop:
+        print(f"❌ Refusing to benchmark {args.database}: all of its tables would be dropped.")
+        print("   Leave out --database to use a temporary SQLite file, or add --i-know-this-drops-tables.")
+        sys.exit(2)
+    if args.database:
+        os.environ['DATABASE_URL'] = args.database
+    else:
+        handle, database_path = tempfile.mkstemp(prefix='tourismhub_benchmark_', suffix='.db')
+        os.close(handle)
+        os.environ['DATABASE_URL'] = f'sqlite:///{database_path}'
+
+    # Import only after DATABASE_URL is set so the app binds to the benchmark database
+    import app as app_module
+    from app import app, db
+    import models
+
+    stub_external_services(app_module)
+    app.config['TESTING'] = True
+
+    try:
+        with app.app_context():
+            print(f"🔄 Seeding {os.environ['DATABASE_URL']} ...")
+            db.drop_all()
+            db.create_all()
+            seed_started = time.perf_counter()
+            seeded = seed_database(db, vars(models), args, rng)
+            seed_seconds = time.perf_counter() - seed_started
+            print(f"✅ Seeded in {seed_seconds:.1f}s")
+
+        report = {
+            'generated_at': datetime.utcnow().isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'database': 'sqlite' if database_path else args.database.split(':', 1)[0],
+            'dataset': {
+                'hotels': args.hotels, 'room_types_per_hotel': args.room_types, 'users': args.users,
+                'bookings': args.bookings, 'reviews': args.reviews, 'rentals': args.rentals,
+                'vehicles_per_rental': args.vehicles, 'vehicle_bookings': args.vehicle_bookings,
+                'owner_share': args.owner_share, 'seed': args.seed
+            },
+            'seed_seconds': round(seed_seconds, 2),
+            'requests_per_route': args.requests,
+            'routes': {}
+        }
+
+        for name, (user_id, next_url) in build_scenarios(seeded, rng).items():
+            summary = run_route(app, user_id, next_url, args.requests, args.warmup)
+            report['routes'][name] = summary
+            latency = summary['latency_ms']
+            print(f"📝 {name:<26} {summary['throughput_rps']:>8.1f} req/s  p50 {latency['p50']:>7.1f} ms  "
+                  f"p95 {latency['p95']:>7.1f} ms  queries {summary['queries_per_request']['mean']}  "
+                  f"errors {summary['errors']}")
+
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"\n🎉 Report written to {args.output}")
+
+        if args.compare:
+            print_comparison(report, args.compare)
+    finally:
+        if database_path and os.path.exists(database_path):
+            os.remove(database_path)
+
+
+if __name__ == '__main__':
+    main()
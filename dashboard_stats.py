@@ -0,0 +1,275 @@
+# Dashboard Statistics for TourismHub
+# This module computes dashboard figures with GROUP BY queries so dashboards
+# render pre-aggregated numbers instead of loading and summing every booking
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import case, extract, func
+from sqlalchemy.orm import joinedload
+
+from models import db, User, Admin, Hotel, RoomType, RoomAvailability, Booking, Vehicle, VehicleRental, VehicleBooking
+from inventory import LIVE_BOOKING_STATUSES
+from pagination import id_page
+
+# Booking statuses counted as earned revenue in monthly rollups
+REVENUE_STATUSES = ('confirmed', 'completed')
+
+# Default windows for the rollups
+REVENUE_MONTHS = 12
+OCCUPANCY_DAYS = 30
+UTILIZATION_DAYS = 30
+
+# Seconds the superadmin headline numbers are served from memory
+METRICS_TTL_SECONDS = 30
+
+_metrics_lock = threading.Lock()
+_metrics_cache = {'value': None, 'expires_at': 0.0}
+
+
+def month_parts(column):
+    """(year, month) of a date/datetime column; EXTRACT compiles on every supported database"""
+    return extract('year', column), extract('month', column)
+
+
+def days_between(end, start):
+    """Whole days from start to end for two date expressions, in the bound database's dialect"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return func.julianday(end) - func.julianday(start)
+    if dialect in ('mysql', 'mariadb'):
+        return func.datediff(end, start)
+    # PostgreSQL and most others return a day count for date - date
+    return end - start
+
+
+def recent_months(today: date, months: int) -> List[str]:
+    """The last `months` YYYY-MM keys ending with the current month, oldest first"""
+    keys = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        keys.append(f'{year:04d}-{month:02d}')
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return list(reversed(keys))
+
+
+def status_rollup(rows) -> Tuple[dict, int, float]:
+    """Turn (status, count, amount) rows into a per-status dict plus totals"""
+    by_status = {}
+    total_count, total_amount = 0, 0.0
+    for status, count, amount in rows:
+        by_status[status] = {'count': count, 'revenue': float(amount or 0)}
+        total_count += count
+        total_amount += float(amount or 0)
+    return by_status, total_count, total_amount
+
+
+def hotel_owner_summary(owner_id: int, today: Optional[date] = None,
+                        months: int = REVENUE_MONTHS, occupancy_days: int = OCCUPANCY_DAYS) -> dict:
+    """Aggregated figures for every hotel of one owner"""
+    today = today or date.today()
+    owned = Hotel.owner_id == owner_id
+
+    hotel_count, approved_hotels = db.session.query(
+        func.count(Hotel.id),
+        func.coalesce(func.sum(case((Hotel.is_approved == True, 1), else_=0)), 0)
+    ).filter(owned).one()
+
+    # Active room types and rooms per hotel
+    room_types_by_hotel = {}
+    total_rooms = 0
+    for hotel_id, room_type_count, rooms in db.session.query(
+        RoomType.hotel_id, func.count(RoomType.id), func.coalesce(func.sum(RoomType.total_rooms), 0)
+    ).join(Hotel, Hotel.id == RoomType.hotel_id).filter(owned, RoomType.is_active == True).group_by(RoomType.hotel_id):
+        room_types_by_hotel[hotel_id] = {'room_types': room_type_count, 'rooms': rooms}
+        total_rooms += rooms
+
+    # Booking counts and amounts by status
+    bookings_by_status, total_bookings, total_revenue = status_rollup(
+        db.session.query(Booking.status, func.count(Booking.id), func.sum(Booking.total_amount))
+        .join(Hotel, Hotel.id == Booking.hotel_id)
+        .filter(owned)
+        .group_by(Booking.status)
+    )
+
+    # Earned revenue per check-in month
+    month_keys = recent_months(today, months)
+    year, month = month_parts(Booking.check_in)
+    revenue = {
+        f'{int(row_year):04d}-{int(row_month):02d}': amount
+        for row_year, row_month, amount in db.session.query(year, month, func.sum(Booking.total_amount))
+        .join(Hotel, Hotel.id == Booking.hotel_id)
+        .filter(owned, Booking.status.in_(REVENUE_STATUSES), Booking.check_in >= date.fromisoformat(month_keys[0] + '-01'))
+        .group_by(year, month)
+    }
+    revenue_by_month = [(key, float(revenue.get(key) or 0)) for key in month_keys]
+
+    # Occupancy per night from the room-type calendar
+    occupancy_by_night = []
+    for night, booked, capacity in (
+        db.session.query(
+            RoomAvailability.date,
+            func.sum(RoomAvailability.booked_rooms),
+            func.sum(RoomAvailability.booked_rooms + RoomAvailability.available_rooms)
+        )
+        .join(RoomType, RoomType.id == RoomAvailability.room_type_id)
+        .join(Hotel, Hotel.id == RoomType.hotel_id)
+        .filter(owned, RoomType.is_active == True,
+                RoomAvailability.date >= today, RoomAvailability.date < today + timedelta(days=occupancy_days))
+        .group_by(RoomAvailability.date)
+        .order_by(RoomAvailability.date)
+    ):
+        booked, capacity = booked or 0, capacity or 0
+        occupancy_by_night.append({
+            'date': night,
+            'booked': booked,
+            'capacity': capacity,
+            'rate': round(100.0 * booked / capacity, 1) if capacity else 0.0
+        })
+
+    return {
+        'hotel_count': hotel_count,
+        'approved_hotels': approved_hotels,
+        'total_rooms': total_rooms,
+        'room_types_by_hotel': room_types_by_hotel,
+        'total_bookings': total_bookings,
+        'total_revenue': total_revenue,
+        'bookings_by_status': bookings_by_status,
+        'revenue_by_month': revenue_by_month,
+        'occupancy_by_night': occupancy_by_night
+    }
+
+
+def vehicle_owner_summary(owner_id: int, today: Optional[date] = None,
+                          utilization_days: int = UTILIZATION_DAYS) -> dict:
+    """Aggregated fleet figures for every rental company of one owner.
+
+    Utilization is the share of vehicle-days held by live bookings over the
+    next `utilization_days` days, per company.
+    """
+    today = today or date.today()
+    window_end = today + timedelta(days=utilization_days)
+    owned = VehicleRental.owner_id == owner_id
+
+    # Vehicle rows and units per company
+    companies = {}
+    for rental_id, vehicle_count, units in db.session.query(
+        Vehicle.rental_company_id, func.count(Vehicle.id), func.coalesce(func.sum(Vehicle.total_vehicles), 0)
+    ).join(VehicleRental, VehicleRental.id == Vehicle.rental_company_id).filter(owned).group_by(Vehicle.rental_company_id):
+        companies[rental_id] = {
+            'vehicles': vehicle_count,
+            'units': units,
+            'booked_days': 0,
+            'capacity_days': units * utilization_days,
+            'utilization': 0.0
+        }
+
+    # Booked vehicle-days inside the window, clipped to its edges
+    starts = case((VehicleBooking.pickup_date > today, VehicleBooking.pickup_date), else_=today)
+    ends = case((VehicleBooking.return_date < window_end, VehicleBooking.return_date), else_=window_end)
+    for rental_id, booked_days in db.session.query(
+        VehicleBooking.rental_company_id, func.sum(days_between(ends, starts))
+    ).join(VehicleRental, VehicleRental.id == VehicleBooking.rental_company_id).filter(
+        owned,
+        VehicleBooking.status.in_(LIVE_BOOKING_STATUSES),
+        VehicleBooking.pickup_date < window_end,
+        VehicleBooking.return_date > today
+    ).group_by(VehicleBooking.rental_company_id):
+        company = companies.get(rental_id)
+        if company is None:
+            continue
+        company['booked_days'] = int(booked_days or 0)
+        if company['capacity_days']:
+            company['utilization'] = round(100.0 * company['booked_days'] / company['capacity_days'], 1)
+
+    # Booking counts and amounts by status across all companies
+    bookings_by_status, total_bookings, total_revenue = status_rollup(
+        db.session.query(VehicleBooking.status, func.count(VehicleBooking.id), func.sum(VehicleBooking.total_amount))
+        .join(VehicleRental, VehicleRental.id == VehicleBooking.rental_company_id)
+        .filter(owned)
+        .group_by(VehicleBooking.status)
+    )
+
+    return {
+        'vehicles_count': sum(company['vehicles'] for company in companies.values()),
+        'units': sum(company['units'] for company in companies.values()),
+        'companies': companies,
+        'total_bookings': total_bookings,
+        'total_revenue': total_revenue,
+        'bookings_by_status': bookings_by_status,
+        'utilization_days': utilization_days
+    }
+
+
+def vehicle_owner_bookings(owner_id: int, cursor: Optional[str], limit: int):
+    """One newest-first page of bookings across all companies of an owner"""
+    query = VehicleBooking.query.join(VehicleRental, VehicleRental.id == VehicleBooking.rental_company_id) \
+        .filter(VehicleRental.owner_id == owner_id) \
+        .options(joinedload(VehicleBooking.vehicle), joinedload(VehicleBooking.user))
+    return id_page(query, VehicleBooking.id, cursor, limit)
+
+
+def approval_counts(model) -> Tuple[int, int]:
+    """(approved, pending) counts for a model with an is_approved flag"""
+    approved = pending = 0
+    for is_approved, count in db.session.query(model.is_approved, func.count(model.id)).group_by(model.is_approved):
+        if is_approved:
+            approved += count
+        else:
+            pending += count
+    return approved, pending
+
+
+def compute_platform_metrics() -> dict:
+    """Platform-wide tallies for the superadmin dashboard"""
+    users_by_role = dict(db.session.query(User.role, func.count(User.id)).group_by(User.role).all())
+    approved_hotels, pending_hotels = approval_counts(Hotel)
+    approved_rentals, pending_rentals = approval_counts(VehicleRental)
+    bookings_by_status, total_bookings, booking_amount = status_rollup(
+        db.session.query(Booking.status, func.count(Booking.id), func.sum(Booking.total_amount)).group_by(Booking.status)
+    )
+    vehicle_bookings_by_status, total_vehicle_bookings, vehicle_booking_amount = status_rollup(
+        db.session.query(VehicleBooking.status, func.count(VehicleBooking.id), func.sum(VehicleBooking.total_amount))
+        .group_by(VehicleBooking.status)
+    )
+
+    return {
+        'users': sum(users_by_role.values()),
+        'users_by_role': users_by_role,
+        'admins': db.session.query(func.count(Admin.id)).scalar(),
+        'hotels': approved_hotels + pending_hotels,
+        'approved_hotels': approved_hotels,
+        'pending_hotels': pending_hotels,
+        'vehicle_rentals': approved_rentals + pending_rentals,
+        'approved_vehicle_rentals': approved_rentals,
+        'pending_vehicle_rentals': pending_rentals,
+        'bookings_by_status': bookings_by_status,
+        'total_bookings': total_bookings,
+        'booking_amount': booking_amount,
+        'vehicle_bookings_by_status': vehicle_bookings_by_status,
+        'total_vehicle_bookings': total_vehicle_bookings,
+        'vehicle_booking_amount': vehicle_booking_amount,
+        'generated_at': datetime.utcnow().isoformat()
+    }
+
+
+def platform_metrics(ttl_seconds: int = METRICS_TTL_SECONDS) -> dict:
+    """Cached compute_platform_metrics(); counts may lag by up to ttl_seconds"""
+    with _metrics_lock:
+        if _metrics_cache['value'] is not None and time.monotonic() < _metrics_cache['expires_at']:
+            return _metrics_cache['value']
+    value = compute_platform_metrics()
+    with _metrics_lock:
+        _metrics_cache['value'] = value
+        _metrics_cache['expires_at'] = time.monotonic() + ttl_seconds
+    return value
+
+
+def invalidate_platform_metrics():
+    """Drop the cached metrics after an approval, rejection or admin change in this process"""
+    with _metrics_lock:
+        _metrics_cache['value'] = None
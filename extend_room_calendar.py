@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Rolling-horizon job for the room availability calendar.
+Run daily (e.g. from cron) to open the next night for every active room type.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db
+from room_calendar import extend_horizon
+
+def extend_room_calendar():
+    """Create missing calendar nights, including gaps, for all active room types"""
+    with app.app_context():
+        try:
+            print("🔄 Extending room availability calendar...")
+            added = extend_horizon()
+            db.session.commit()
+            print(f"✅ Added {added} calendar rows")
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error extending calendar: {str(e)}")
+            return False
+
+    return True
+
+if __name__ == "__main__":
+    if not extend_room_calendar():
+        sys.exit(1)
@@ -0,0 +1,11 @@
+# Gunicorn Configuration for TourismHub
+# Gunicorn loads this file automatically when started from the project directory.
+# For /metrics to report every worker, export PROMETHEUS_MULTIPROC_DIR pointing at an
+# empty directory before starting Gunicorn (clear it on each restart).
+
+import metrics
+
+
+def child_exit(server, worker):
+    """Stop counting a dead worker's in-flight requests"""
+    metrics.mark_process_dead(worker.pid)
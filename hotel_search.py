@@ -0,0 +1,253 @@
+# Hotel Search Index for TourismHub
+# This module keeps an in-process inverted index over approved hotels so the /hotels
+# listing gets ranked full-text search, amenity/category facets and keyset pagination
+# without LIKE scans and JSON parsing on every request
+
+import math
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import selectinload
+
+from models import Hotel
+from pagination import encode_cursor, decode_cursor
+
+# Seconds the index is trusted before it is rebuilt from the database, so
+# changes made through other worker processes show up within this window
+INDEX_TTL_SECONDS = 60
+
+# Relative weight of a term depending on the field it appears in
+FIELD_WEIGHTS = {'name': 3.0, 'city': 2.0, 'address': 1.0, 'description': 1.0}
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Orders search() understands; anything else falls back to a name sort
+SORT_FIELDS = ('relevance', 'name', 'price', 'rating')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class HotelSearchIndex:
+    """Inverted index and facet data for approved hotels"""
+
+    def __init__(self, ttl_seconds: int = INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._documents: Dict[int, dict] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []
+        self._built_at = None
+
+    # Index maintenance
+
+    def _document(self, hotel) -> dict:
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(hotel, field)):
+                weights[token] = weights.get(token, 0.0) + weight
+        return {
+            'id': hotel.id,
+            'name': hotel.name or '',
+            'city': hotel.city or '',
+            'category': hotel.category or 'Standard',
+            'price': hotel.price_per_night or 0.0,
+            'rating': hotel.rating or 0.0,
+            'amenities': set(hotel.amenity_names),
+            'terms': weights
+        }
+
+    def _add(self, document: dict):
+        self._documents[document['id']] = document
+        for token, weight in document['terms'].items():
+            self._postings.setdefault(token, {})[document['id']] = weight
+
+    def _discard(self, hotel_id: int):
+        document = self._documents.pop(hotel_id, None)
+        if not document:
+            return
+        for token in document['terms']:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(hotel_id, None)
+                if not posting:
+                    del self._postings[token]
+
+    def rebuild(self):
+        """Rebuild the whole index from approved hotels"""
+        hotels = Hotel.query.filter_by(is_approved=True).options(selectinload(Hotel.amenity_items)).all()
+        with self._lock:
+            self._documents = {}
+            self._postings = {}
+            for hotel in hotels:
+                self._add(self._document(hotel))
+            self._terms = sorted(self._postings)
+            self._built_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._built_at is None or time.monotonic() - self._built_at >= self.ttl_seconds:
+            self.rebuild()
+
+    def upsert(self, hotel):
+        """Index or re-index a hotel after it is created, edited, approved or re-rated"""
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._discard(hotel.id)
+            if hotel.is_approved:
+                self._add(self._document(hotel))
+            self._terms = sorted(self._postings)
+
+    def remove(self, hotel_id: int):
+        """Drop a hotel that was rejected or deleted"""
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._discard(hotel_id)
+            self._terms = sorted(self._postings)
+
+    # Querying
+
+    def _expand(self, token: str) -> List[str]:
+        """Index terms starting with the query token"""
+        start = bisect_left(self._terms, token)
+        matches = []
+        for term in self._terms[start:]:
+            if not term.startswith(token):
+                break
+            matches.append(term)
+        return matches
+
+    def _score(self, query: str) -> Optional[Dict[int, float]]:
+        """Relevance score per hotel matching every query token, or None for no query"""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        total = max(1, len(self._documents))
+        scores: Optional[Dict[int, float]] = None
+        for token in tokens:
+            token_scores: Dict[int, float] = {}
+            for term in self._expand(token):
+                posting = self._postings[term]
+                idf = math.log(1 + total / len(posting))
+                for hotel_id, weight in posting.items():
+                    token_scores[hotel_id] = max(token_scores.get(hotel_id, 0.0), weight * idf)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {hotel_id: score + token_scores[hotel_id]
+                          for hotel_id, score in scores.items() if hotel_id in token_scores}
+            if not scores:
+                return {}
+        return scores
+
+    @staticmethod
+    def _sort_key(document: dict, sort_by: str, score: float):
+        if sort_by == 'relevance':
+            return (-round(score, 6), document['id'])
+        if sort_by == 'price':
+            return (document['price'], document['id'])
+        if sort_by == 'rating':
+            return (document['rating'], document['id'])
+        return (document['name'].lower(), document['id'])
+
+    @staticmethod
+    def _valid_cursor(after, sort_by: str) -> bool:
+        """Whether a decoded cursor has the shape of a _sort_key() for sort_by"""
+        if after is None or len(after) != 2 or type(after[1]) is not int:
+            return False
+        if sort_by == 'name':
+            return isinstance(after[0], str)
+        return isinstance(after[0], (int, float)) and not isinstance(after[0], bool)
+
+    def search(self, query: str = '', city: str = '', category: str = '',
+               min_price: Optional[float] = None, max_price: Optional[float] = None,
+               min_rating: Optional[int] = None, amenities: Optional[List[str]] = None,
+               sort_by: str = 'name', sort_order: str = 'asc',
+               cursor: Optional[str] = None, limit: int = 20) -> dict:
+        """Filter, rank and page approved hotels.
+
+        Returns the ids of the requested page in order, the total number of
+        matches, facet counts over the matches and the cursor of the next page.
+        """
+        if sort_by not in SORT_FIELDS:
+            sort_by = 'name'
+        self._ensure_fresh()
+        amenities = amenities or []
+        with self._lock:
+            scores = self._score(query)
+            if sort_by == 'relevance' and scores is None:
+                sort_by = 'name'
+
+            candidates = self._documents.values() if scores is None else (
+                self._documents[hotel_id] for hotel_id in scores)
+            matches = []
+            for document in candidates:
+                if city and document['city'] != city:
+                    continue
+                if category and document['category'] != category:
+                    continue
+                if min_price is not None and document['price'] < min_price:
+                    continue
+                if max_price is not None and document['price'] > max_price:
+                    continue
+                if min_rating and document['rating'] < min_rating:
+                    continue
+                if any(amenity not in document['amenities'] for amenity in amenities):
+                    continue
+                matches.append(document)
+
+            amenity_counts = {amenity: 0 for document in self._documents.values()
+                              for amenity in document['amenities']}
+            category_counts: Dict[str, int] = {}
+            for document in matches:
+                for amenity in document['amenities']:
+                    amenity_counts[amenity] += 1
+                category_counts[document['category']] = category_counts.get(document['category'], 0) + 1
+            cities = sorted({document['city'] for document in self._documents.values() if document['city']})
+
+            descending = sort_order == 'desc' and sort_by != 'relevance'
+            keyed = sorted(
+                ((self._sort_key(document, sort_by, scores[document['id']] if scores else 0.0), document['id'])
+                 for document in matches),
+                reverse=descending
+            )
+
+        # A stale or tampered cursor (e.g. from before the sort changed) restarts at the first page
+        after = decode_cursor(cursor)
+        start = 0
+        if self._valid_cursor(after, sort_by):
+            keys = [key for key, _ in keyed]
+            if descending:
+                keys.reverse()
+                start = len(keys) - bisect_left(keys, after)
+            else:
+                start = bisect_right(keys, after)
+
+        page = keyed[start:start + limit]
+        next_cursor = None
+        if start + limit < len(keyed) and page:
+            next_cursor = encode_cursor(page[-1][0])
+
+        return {
+            'ids': [hotel_id for _, hotel_id in page],
+            'total': len(keyed),
+            'facets': {
+                'amenities': dict(sorted(amenity_counts.items())),
+                'categories': dict(sorted(category_counts.items())),
+                'cities': cities
+            },
+            'sort_by': sort_by,
+            'next_cursor': next_cursor
+        }
+
+
+# Shared index instance used by the Flask routes
+hotel_search_index = HotelSearchIndex()
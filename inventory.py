@@ -0,0 +1,574 @@
+# Room Inventory Engine for TourismHub
+# This module keeps per-night occupancy counters for hotels and room types so that
+# availability checks are range queries instead of rescans of the Booking table
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, func, update
+
+from models import db, Booking, RoomAvailability, RoomType, VehicleBooking
+from room_calendar import insert_nights
+
+# Booking statuses that hold rooms
+LIVE_BOOKING_STATUSES = ('pending', 'confirmed')
+
+# Seconds a ledger is trusted before it is rebuilt from the database.
+# Other gunicorn workers create bookings too, so in-process counters are
+# refreshed periodically instead of being kept forever.
+LEDGER_TTL_SECONDS = 60
+
+# Number of nights a fresh ledger covers before it has to grow
+DEFAULT_HORIZON_DAYS = 400
+
+
+class MaxSegmentTree:
+    """Segment tree over integer counters answering range-max queries"""
+
+    def __init__(self, values: List[int]):
+        size = 1
+        while size < max(1, len(values)):
+            size *= 2
+        self.size = size
+        self.tree = [0] * (2 * size)
+        self.tree[size:size + len(values)] = values
+        for i in range(size - 1, 0, -1):
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def values(self) -> List[int]:
+        """Return the leaf counters"""
+        return self.tree[self.size:]
+
+    def value(self, index: int) -> int:
+        """Return a single leaf counter"""
+        return self.tree[self.size + index]
+
+    def add(self, index: int, delta: int):
+        """Add delta to one leaf and refresh its ancestors"""
+        i = self.size + index
+        self.tree[i] += delta
+        i //= 2
+        while i:
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+    def max(self, lo: int, hi: int) -> int:
+        """Return the largest counter in the half-open leaf range [lo, hi)"""
+        result = 0
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                result = max(result, self.tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                result = max(result, self.tree[hi])
+            lo //= 2
+            hi //= 2
+        return result
+
+
+class NightLedger:
+    """Booked-room counters for one hotel or room type, indexed by night"""
+
+    def __init__(self, origin: date, horizon_days: int = DEFAULT_HORIZON_DAYS):
+        self.origin = origin
+        self.tree = MaxSegmentTree([0] * horizon_days)
+        self.built_at = time.monotonic()
+        # Sorted check-in / check-out dates, used to count overlapping bookings
+        self.starts: List[date] = []
+        self.ends: List[date] = []
+
+    def _offset(self, night: date) -> int:
+        return (night - self.origin).days
+
+    def _ensure_covers(self, start: date, end: date):
+        """Grow the ledger so that nights in [start, end) have counters"""
+        if start >= self.origin and self._offset(end) <= self.tree.size:
+            return
+        new_origin = min(self.origin, start)
+        shift = (self.origin - new_origin).days
+        values = [0] * shift + self.tree.values()
+        needed = (end - new_origin).days
+        if needed > len(values):
+            values.extend([0] * (needed - len(values)))
+        self.origin = new_origin
+        self.tree = MaxSegmentTree(values)
+
+    def _apply(self, start: date, end: date, rooms: int):
+        self._ensure_covers(start, end)
+        for offset in range(self._offset(start), self._offset(end)):
+            self.tree.add(offset, rooms)
+
+    def add(self, start: date, end: date, rooms: int):
+        """Record a booking holding `rooms` rooms for nights in [start, end)"""
+        if end <= start:
+            return
+        self._apply(start, end, rooms)
+        insort(self.starts, start)
+        insort(self.ends, end)
+
+    def remove(self, start: date, end: date, rooms: int):
+        """Release a booking previously recorded with add()"""
+        if end <= start:
+            return
+        self._apply(start, end, -rooms)
+        i = bisect_left(self.starts, start)
+        if i < len(self.starts) and self.starts[i] == start:
+            del self.starts[i]
+        i = bisect_left(self.ends, end)
+        if i < len(self.ends) and self.ends[i] == end:
+            del self.ends[i]
+
+    def peak_booked(self, start: date, end: date) -> int:
+        """Highest number of rooms booked on any night in [start, end)"""
+        lo = max(0, self._offset(start))
+        hi = min(self.tree.size, self._offset(end))
+        if lo >= hi:
+            return 0
+        return self.tree.max(lo, hi)
+
+    def booked_on(self, night: date) -> int:
+        """Rooms booked on a single night"""
+        offset = self._offset(night)
+        if 0 <= offset < self.tree.size:
+            return self.tree.value(offset)
+        return 0
+
+    def overlapping_count(self, start: date, end: date) -> int:
+        """Number of bookings with check_in < end and check_out > start"""
+        starting_later = len(self.starts) - bisect_left(self.starts, end)
+        ended_before = bisect_right(self.ends, start)
+        return max(0, len(self.starts) - starting_later - ended_before)
+
+
+class RoomInventory:
+    """Per-process cache of night ledgers for hotels and room types"""
+
+    def __init__(self, ttl_seconds: int = LEDGER_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._ledgers: Dict[Tuple[str, int], NightLedger] = {}
+        self._lock = threading.RLock()
+
+    def _intervals(self, kind: str, key: int, start: date = None, end: date = None) -> List[Tuple[date, date, int]]:
+        """(check_in, check_out, rooms) of live bookings, optionally only those overlapping [start, end)"""
+        column = Booking.hotel_id if kind == 'hotel' else Booking.room_type_id
+        query = db.session.query(Booking.check_in, Booking.check_out, Booking.rooms).filter(
+            column == key,
+            Booking.status.in_(LIVE_BOOKING_STATUSES)
+        )
+        if start and end:
+            query = query.filter(Booking.check_in < end, Booking.check_out > start)
+        return [tuple(row) for row in query]
+
+    def _load(self, kind: str, key: int) -> NightLedger:
+        """Build a ledger from the live bookings in the database"""
+        intervals = self._intervals(kind, key)
+
+        origin = min([date.today()] + [begin for begin, _, _ in intervals])
+        ledger = NightLedger(origin)
+        for begin, end, units in intervals:
+            ledger.add(begin, end, units)
+        return ledger
+
+    def _ledger(self, kind: str, key: int) -> NightLedger:
+        with self._lock:
+            ledger = self._ledgers.get((kind, key))
+            if ledger and time.monotonic() - ledger.built_at < self.ttl_seconds:
+                return ledger
+
+        ledger = self._load(kind, key)
+        with self._lock:
+            self._ledgers[(kind, key)] = ledger
+        return ledger
+
+    def _keys_for(self, booking) -> List[Tuple[str, int]]:
+        keys = [('hotel', booking.hotel_id)]
+        if booking.room_type_id:
+            keys.append(('room_type', booking.room_type_id))
+        return keys
+
+    def _span(self, booking) -> Tuple[date, date, int]:
+        return booking.check_in, booking.check_out, booking.rooms
+
+    def peak_booked(self, kind: str, key: int, check_in: date, check_out: date) -> int:
+        """Highest nightly room count booked over [check_in, check_out)"""
+        ledger = self._ledger(kind, key)
+        with self._lock:
+            return ledger.peak_booked(check_in, check_out)
+
+    def free_rooms(self, kind: str, key: int, total_rooms: int, check_in: date, check_out: date) -> int:
+        """Minimum number of free rooms on any night in [check_in, check_out)"""
+        return max(0, (total_rooms or 0) - self.peak_booked(kind, key, check_in, check_out))
+
+    def live_peak_booked(self, kind: str, key: int, check_in: date, check_out: date) -> int:
+        """Like peak_booked(), but counted from the database at call time.
+
+        Ledgers may be up to ttl_seconds old and miss other workers' bookings,
+        so anything that decides whether a booking may be created uses this.
+        """
+        return max([booked for _, booked in self.live_nightly_booked(kind, key, check_in, check_out)], default=0)
+
+    def live_free_rooms(self, kind: str, key: int, total_rooms: int, check_in: date, check_out: date) -> int:
+        """Like free_rooms(), but counted from the database at call time"""
+        return max(0, (total_rooms or 0) - self.live_peak_booked(kind, key, check_in, check_out))
+
+    def live_nightly_booked(self, kind: str, key: int, check_in: date, check_out: date) -> List[Tuple[date, int]]:
+        """Like nightly_booked(), but counted from the database at call time"""
+        days = max(0, (check_out - check_in).days)
+        counts = daily_counts(self._intervals(kind, key, check_in, check_out), check_in, days)
+        return [(check_in + timedelta(days=offset), booked) for offset, booked in enumerate(counts)]
+
+    def live_overlapping_count(self, kind: str, key: int, check_in: date, check_out: date) -> int:
+        """Like overlapping_count(), but counted from the database at call time"""
+        return len(self._intervals(kind, key, check_in, check_out))
+
+    def nightly_booked(self, kind: str, key: int, check_in: date, check_out: date) -> List[Tuple[date, int]]:
+        """Rooms booked on each night in [check_in, check_out)"""
+        ledger = self._ledger(kind, key)
+        nights = []
+        with self._lock:
+            current = check_in
+            while current < check_out:
+                nights.append((current, ledger.booked_on(current)))
+                current += timedelta(days=1)
+        return nights
+
+    def overlapping_count(self, kind: str, key: int, check_in: date, check_out: date) -> int:
+        """Number of live bookings overlapping [check_in, check_out)"""
+        ledger = self._ledger(kind, key)
+        with self._lock:
+            return ledger.overlapping_count(check_in, check_out)
+
+    def record_booking(self, booking):
+        """Apply a newly created live booking to any loaded ledgers"""
+        with self._lock:
+            for key in self._keys_for(booking):
+                ledger = self._ledgers.get(key)
+                if ledger:
+                    ledger.add(*self._span(booking))
+
+    def release_booking(self, booking):
+        """Remove a cancelled, rejected or completed booking from loaded ledgers"""
+        with self._lock:
+            for key in self._keys_for(booking):
+                ledger = self._ledgers.get(key)
+                if ledger:
+                    ledger.remove(*self._span(booking))
+
+    def invalidate(self, kind: str = None, key: int = None):
+        """Drop cached ledgers so they are rebuilt on next use"""
+        with self._lock:
+            if kind is None:
+                self._ledgers.clear()
+            else:
+                self._ledgers.pop((kind, key), None)
+
+
+class FleetInventory(RoomInventory):
+    """Per-process cache of daily ledgers counting vehicle units in use.
+
+    Every live VehicleBooking holds one unit of its Vehicle from pickup_date
+    up to (not including) return_date; capacity is Vehicle.total_vehicles.
+    """
+
+    def _intervals(self, kind: str, key: int, start: date = None, end: date = None) -> List[Tuple[date, date, int]]:
+        """(pickup_date, return_date, 1) of one vehicle's live bookings, optionally only those overlapping [start, end)"""
+        query = db.session.query(VehicleBooking.pickup_date, VehicleBooking.return_date).filter(
+            VehicleBooking.vehicle_id == key,
+            VehicleBooking.status.in_(LIVE_BOOKING_STATUSES)
+        )
+        if start and end:
+            query = query.filter(VehicleBooking.pickup_date < end, VehicleBooking.return_date > start)
+        return [(row.pickup_date, row.return_date, 1) for row in query]
+
+    def _keys_for(self, booking) -> List[Tuple[str, int]]:
+        return [('vehicle', booking.vehicle_id)]
+
+    def _span(self, booking) -> Tuple[date, date, int]:
+        return booking.pickup_date, booking.return_date, 1
+
+    def free_units(self, vehicle, pickup_date: date, return_date: date) -> int:
+        """Minimum number of free units of a vehicle on any day in [pickup_date, return_date)"""
+        return self.free_rooms('vehicle', vehicle.id, vehicle.total_vehicles, pickup_date, return_date)
+
+    def live_free_units(self, vehicle, pickup_date: date, return_date: date) -> int:
+        """Like free_units(), but counted from the database at call time; use this before booking"""
+        return self.live_free_rooms('vehicle', vehicle.id, vehicle.total_vehicles, pickup_date, return_date)
+
+    def overbooked(self, vehicle, pickup_date: date, return_date: date) -> bool:
+        """Whether live bookings, including any flushed in this transaction, exceed total_vehicles on some day"""
+        return self.live_peak_booked('vehicle', vehicle.id, pickup_date, return_date) > (vehicle.total_vehicles or 0)
+
+    def daily_in_use(self, vehicle, pickup_date: date, return_date: date) -> List[Tuple[date, int]]:
+        """Units of a vehicle in use on each day in [pickup_date, return_date)"""
+        return self.nightly_booked('vehicle', vehicle.id, pickup_date, return_date)
+
+
+# Shared inventory instances used by the Flask routes
+room_inventory = RoomInventory()
+fleet_inventory = FleetInventory()
+
+
+def lock_for_booking(model, row_id: int):
+    """Lock the hotel or vehicle row `row_id` until the transaction ends.
+
+    Concurrent bookings of the same hotel or vehicle then count availability
+    one after another. On Postgres and MySQL this is SELECT ... FOR UPDATE;
+    SQLite has no row locks and ignores it, but only lets one transaction
+    write at a time, so there the check after flushing the booking decides.
+    """
+    db.session.query(model.id).filter(model.id == row_id).with_for_update().scalar()
+
+
+# RoomAvailability calendar - the authoritative per-night room counts.
+# Reservations decrement the calendar with one conditional UPDATE so two
+# requests can never both take the last room.
+
+def ensure_room_calendar(room_type, check_in: date, check_out: date):
+    """Create RoomAvailability rows for nights in [check_in, check_out) that have none"""
+    existing = {
+        row.date for row in db.session.query(RoomAvailability.date).filter(
+            RoomAvailability.room_type_id == room_type.id,
+            RoomAvailability.date >= check_in,
+            RoomAvailability.date < check_out
+        )
+    }
+    if len(existing) == (check_out - check_in).days:
+        return
+
+    # Seed from the bookings as they are now, not from this worker's cached ledger
+    booked_by_night = dict(room_inventory.live_nightly_booked('room_type', room_type.id, check_in, check_out))
+    insert_nights(room_type, (night for night in booked_by_night if night not in existing), booked_by_night,
+                  skip_existing=True)
+
+
+def reserve_room_nights(room_type, check_in: date, check_out: date, rooms: int) -> bool:
+    """Take `rooms` rooms from every night in [check_in, check_out).
+
+    Runs a single UPDATE guarded by available_rooms >= rooms. If any night is
+    short the transaction is rolled back and False is returned; on success the
+    caller commits the decrement together with its Booking row.
+    """
+    nights = (check_out - check_in).days
+    if nights <= 0 or rooms <= 0:
+        return False
+
+    ensure_room_calendar(room_type, check_in, check_out)
+    result = db.session.execute(
+        update(RoomAvailability)
+        .where(
+            RoomAvailability.room_type_id == room_type.id,
+            RoomAvailability.date >= check_in,
+            RoomAvailability.date < check_out,
+            RoomAvailability.available_rooms >= rooms
+        )
+        .values(
+            available_rooms=RoomAvailability.available_rooms - rooms,
+            booked_rooms=RoomAvailability.booked_rooms + rooms
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != nights:
+        db.session.rollback()
+        return False
+    return True
+
+
+def release_room_nights(booking):
+    """Give a room-type booking's nights back to the calendar (caller commits).
+
+    Counts are clamped to the room type's size so a repeated release cannot
+    push a night above total_rooms.
+    """
+    if not booking.room_type_id:
+        return
+    total_rooms = db.session.query(RoomType.total_rooms).filter(RoomType.id == booking.room_type_id).scalar() or 0
+    restored = RoomAvailability.available_rooms + booking.rooms
+    remaining = RoomAvailability.booked_rooms - booking.rooms
+    db.session.execute(
+        update(RoomAvailability)
+        .where(
+            RoomAvailability.room_type_id == booking.room_type_id,
+            RoomAvailability.date >= booking.check_in,
+            RoomAvailability.date < booking.check_out
+        )
+        .values(
+            available_rooms=case((restored > total_rooms, total_rooms), else_=restored),
+            booked_rooms=case((remaining > 0, remaining), else_=0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def room_type_nightly(room_type, check_in: date, check_out: date) -> List[Tuple[date, int, int]]:
+    """(night, available_rooms, booked_rooms) for each night in [check_in, check_out)"""
+    rows = {
+        row.date: (row.available_rooms, row.booked_rooms or 0)
+        for row in db.session.query(
+            RoomAvailability.date, RoomAvailability.available_rooms, RoomAvailability.booked_rooms
+        ).filter(
+            RoomAvailability.room_type_id == room_type.id,
+            RoomAvailability.date >= check_in,
+            RoomAvailability.date < check_out
+        )
+    }
+    if len(rows) == (check_out - check_in).days:
+        return [(night, available, booked) for night, (available, booked) in sorted(rows.items())]
+
+    # Nights outside the calendar horizon fall back to the booking ledger
+    total_rooms = room_type.total_rooms or 0
+    nights = []
+    for night, booked in room_inventory.nightly_booked('room_type', room_type.id, check_in, check_out):
+        if night in rows:
+            nights.append((night,) + rows[night])
+        else:
+            nights.append((night, max(0, total_rooms - booked), booked))
+    return nights
+
+
+def room_type_free_rooms(room_type, check_in: date, check_out: date) -> int:
+    """Minimum number of free rooms of a room type on any night in [check_in, check_out)"""
+    if check_out <= check_in:
+        return 0
+    lowest, covered = db.session.query(
+        func.min(RoomAvailability.available_rooms), func.count(RoomAvailability.id)
+    ).filter(
+        RoomAvailability.room_type_id == room_type.id,
+        RoomAvailability.date >= check_in,
+        RoomAvailability.date < check_out
+    ).one()
+    if covered == (check_out - check_in).days:
+        return max(0, lowest or 0)
+    return min(available for _, available, _ in room_type_nightly(room_type, check_in, check_out))
+
+
+# Multi-day calendars for many room types or vehicles in one pass.
+# Each entity's bookings are turned into a difference array (+units at the
+# first night, -units after the last) and a prefix sum gives nightly usage,
+# so a window costs O(days + bookings) instead of O(days x bookings).
+
+def daily_counts(intervals: Iterable[Tuple[date, date, int]], start: date, days: int) -> List[int]:
+    """Units in use on each of `days` nights from start, for [begin, end) intervals"""
+    diff = [0] * (days + 1)
+    for begin, end, units in intervals:
+        lo = max(0, (begin - start).days)
+        hi = min(days, (end - start).days)
+        if lo < hi:
+            diff[lo] += units
+            diff[hi] -= units
+    return list(accumulate(diff[:days]))
+
+
+def room_type_calendar(room_types, start: date, days: int) -> Dict[int, dict]:
+    """Nightly availability for several room types over [start, start + days)"""
+    end = start + timedelta(days=days)
+    ids = [room_type.id for room_type in room_types]
+    if not ids:
+        return {}
+
+    calendar_rows: Dict[int, Dict[date, Tuple[int, int]]] = {room_type_id: {} for room_type_id in ids}
+    for row in db.session.query(
+        RoomAvailability.room_type_id, RoomAvailability.date,
+        RoomAvailability.available_rooms, RoomAvailability.booked_rooms
+    ).filter(
+        RoomAvailability.room_type_id.in_(ids),
+        RoomAvailability.date >= start,
+        RoomAvailability.date < end
+    ):
+        calendar_rows[row.room_type_id][row.date] = (row.available_rooms, row.booked_rooms or 0)
+
+    overlapping = dict(
+        db.session.query(Booking.room_type_id, func.count(Booking.id)).filter(
+            Booking.room_type_id.in_(ids),
+            Booking.status.in_(LIVE_BOOKING_STATUSES),
+            Booking.check_in < end,
+            Booking.check_out > start
+        ).group_by(Booking.room_type_id).all()
+    )
+
+    # Nights outside the calendar horizon are derived from the bookings themselves
+    uncovered = [room_type_id for room_type_id in ids if len(calendar_rows[room_type_id]) < days]
+    intervals: Dict[int, List[Tuple[date, date, int]]] = {room_type_id: [] for room_type_id in uncovered}
+    if uncovered:
+        for row in db.session.query(
+            Booking.room_type_id, Booking.check_in, Booking.check_out, Booking.rooms
+        ).filter(
+            Booking.room_type_id.in_(uncovered),
+            Booking.status.in_(LIVE_BOOKING_STATUSES),
+            Booking.check_in < end,
+            Booking.check_out > start
+        ):
+            intervals[row.room_type_id].append((row.check_in, row.check_out, row.rooms))
+
+    result = {}
+    for room_type in room_types:
+        rows = calendar_rows[room_type.id]
+        total_rooms = room_type.total_rooms or 0
+        derived = daily_counts(intervals[room_type.id], start, days) if room_type.id in intervals else None
+        available, booked = [], []
+        for offset in range(days):
+            night = start + timedelta(days=offset)
+            if night in rows:
+                night_available, night_booked = rows[night]
+            else:
+                night_booked = derived[offset]
+                night_available = max(0, total_rooms - night_booked)
+            available.append(night_available)
+            booked.append(night_booked)
+
+        result[room_type.id] = {
+            'name': room_type.name,
+            'total_rooms': room_type.total_rooms,
+            'price_per_night': room_type.price_per_night,
+            'max_occupancy': room_type.max_occupancy,
+            'available': available,
+            'booked': booked,
+            'min_available': min(available) if available else 0,
+            'overlapping_bookings': overlapping.get(room_type.id, 0)
+        }
+    return result
+
+
+def vehicle_calendar(vehicles, start: date, days: int) -> Dict[int, dict]:
+    """Daily availability for several vehicles over [start, start + days).
+
+    Uses the same unit counting as FleetInventory (one unit per live booking
+    against total_vehicles) but in batch form for many vehicles at once.
+    """
+    end = start + timedelta(days=days)
+    ids = [vehicle.id for vehicle in vehicles]
+    if not ids:
+        return {}
+
+    intervals: Dict[int, List[Tuple[date, date, int]]] = {vehicle_id: [] for vehicle_id in ids}
+    for row in db.session.query(
+        VehicleBooking.vehicle_id, VehicleBooking.pickup_date, VehicleBooking.return_date
+    ).filter(
+        VehicleBooking.vehicle_id.in_(ids),
+        VehicleBooking.status.in_(LIVE_BOOKING_STATUSES),
+        VehicleBooking.pickup_date < end,
+        VehicleBooking.return_date > start
+    ):
+        intervals[row.vehicle_id].append((row.pickup_date, row.return_date, 1))
+
+    result = {}
+    for vehicle in vehicles:
+        booked = daily_counts(intervals[vehicle.id], start, days)
+        available = [max(0, vehicle.total_vehicles - in_use) for in_use in booked]
+        result[vehicle.id] = {
+            'name': f"{vehicle.make} {vehicle.model}",
+            'total_vehicles': vehicle.total_vehicles,
+            'price_per_day': vehicle.price_per_day,
+            'price_per_hour': vehicle.price_per_hour,
+            'available': available,
+            'booked': booked,
+            'min_available': min(available) if available else 0,
+            'overlapping_bookings': len(intervals[vehicle.id])
+        }
+    return result
@@ -0,0 +1,102 @@
+# Request Metrics for TourismHub
+# This module records per-endpoint latency histograms, status counts, in-flight
+# requests and outbound API call timings, and renders them in the Prometheus
+# text format. With several Gunicorn workers, set PROMETHEUS_MULTIPROC_DIR to an
+# empty directory before start-up so every worker writes to shared files and a
+# scrape of any worker reports the totals (see gunicorn.conf.py).
+
+import os
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+# Latency buckets in seconds, from cached lookups up to slow itinerary generation
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+OUTBOUND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Label used for requests that matched no route, so 404 probes do not create new series
+UNMATCHED_ENDPOINT = '<unmatched>'
+
+REQUEST_LATENCY = Histogram(
+    'tourismhub_http_request_duration_seconds',
+    'Time spent handling a request, by endpoint',
+    ['method', 'endpoint'],
+    buckets=REQUEST_BUCKETS
+)
+REQUEST_COUNT = Counter(
+    'tourismhub_http_requests_total',
+    'Requests handled, by endpoint and status code',
+    ['method', 'endpoint', 'status']
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'tourismhub_http_requests_in_flight',
+    'Requests currently being handled',
+    multiprocess_mode='livesum'
+)
+OUTBOUND_LATENCY = Histogram(
+    'tourismhub_outbound_request_duration_seconds',
+    'Time spent waiting on external services',
+    ['service', 'outcome'],
+    buckets=OUTBOUND_BUCKETS
+)
+
+
+def _endpoint() -> str:
+    return request.url_rule.rule if request.url_rule is not None else UNMATCHED_ENDPOINT
+
+
+def _start_request():
+    g.metrics_started_at = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+
+
+def _record_response(response):
+    started_at = g.get('metrics_started_at')
+    if started_at is not None:
+        endpoint = _endpoint()
+        REQUEST_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - started_at)
+        REQUEST_COUNT.labels(request.method, endpoint, str(response.status_code)).inc()
+    return response
+
+
+def _finish_request(exc):
+    if g.pop('metrics_started_at', None) is not None:
+        REQUESTS_IN_FLIGHT.dec()
+
+
+def init_app(app):
+    """Time every request of `app`"""
+    app.before_request(_start_request)
+    app.after_request(_record_response)
+    app.teardown_request(_finish_request)
+
+
+@contextmanager
+def outbound_call(service: str):
+    """Time a call to an external service; failures are recorded with outcome="error"."""
+    started_at = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        OUTBOUND_LATENCY.labels(service, outcome).observe(time.perf_counter() - started_at)
+
+
+def render_metrics():
+    """(body, content type) of the Prometheus exposition for all workers"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """Drop a dead worker's live gauges; called from Gunicorn's child_exit hook"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Migration script to backfill the normalized amenity tables from the
+JSON amenities/features columns of hotels, room types and vehicles
+"""
+
+import sys
+import os
+import json
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, Hotel, RoomType, Vehicle
+from amenities import clean_names, get_or_create_amenities
+
+def parse_names(value):
+    """Parse a JSON list column, ignoring malformed data"""
+    if not value:
+        return []
+    try:
+        names = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return clean_names(name for name in names if isinstance(name, str)) if isinstance(names, list) else []
+
+def migrate_amenities():
+    """Create the amenity tables and link every row to its amenities"""
+    with app.app_context():
+        try:
+            print("🔄 Starting amenity migration...")
+
+            # Creates amenity, hotel_amenity, room_type_amenity and vehicle_feature if missing
+            db.create_all()
+
+            sources = [
+                ('hotels', Hotel.query.all(), 'amenities', 'amenity_items'),
+                ('room types', RoomType.query.all(), 'amenities', 'amenity_items'),
+                ('vehicles', Vehicle.query.all(), 'features', 'feature_items'),
+            ]
+
+            # Create every amenity row up front so each name is looked up once
+            all_names = set()
+            for _, items, column, _ in sources:
+                for item in items:
+                    all_names.update(parse_names(getattr(item, column)))
+            amenities = {amenity.name: amenity for amenity in get_or_create_amenities(sorted(all_names))}
+            print(f"📊 Found {len(amenities)} distinct amenities")
+
+            for label, items, column, relationship in sources:
+                linked_count = 0
+                for item in items:
+                    names = parse_names(getattr(item, column))
+                    current = {amenity.name for amenity in getattr(item, relationship)}
+                    if set(names) != current:
+                        setattr(item, relationship, [amenities[name] for name in names])
+                        linked_count += 1
+                print(f"📝 Linked amenities for {linked_count} of {len(items)} {label}")
+
+            db.session.commit()
+            print("🎉 Amenity migration completed successfully!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+    return True
+
+if __name__ == "__main__":
+    success = migrate_amenities()
+    if success:
+        print("\n✅ Migration completed successfully!")
+    else:
+        print("\n❌ Migration failed!")
+        sys.exit(1)
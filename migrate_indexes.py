@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Migration script to add composite indexes for booking overlap,
+review listing and hotel listing queries to an existing database
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db
+from models import missing_indexes
+
+def migrate_indexes():
+    """Create every declared index that is missing from the database"""
+    with app.app_context():
+        try:
+            print("🔄 Starting index migration...")
+
+            missing = set(missing_indexes(db.engine))
+            if not missing:
+                print("✅ All indexes already exist")
+                return True
+
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    if index.name in missing:
+                        print(f"📝 Creating index {index.name} on {table.name}...")
+                        index.create(bind=db.engine, checkfirst=True)
+
+            print(f"🎉 Created {len(missing)} indexes")
+
+        except Exception as e:
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+    return True
+
+if __name__ == "__main__":
+    success = migrate_indexes()
+    if success:
+        print("\n✅ Migration completed successfully!")
+    else:
+        print("\n❌ Migration failed!")
+        sys.exit(1)
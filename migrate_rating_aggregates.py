@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the rating_sum column to hotels and vehicle rental
+companies and fill the rating aggregates from existing reviews.
+Re-run at any time (e.g. nightly from cron) to repair drifted aggregates.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app import app, db
+from ratings import repair_rating_aggregates
+
+def migrate_rating_aggregates():
+    """Add missing rating_sum columns and recompute every rating aggregate"""
+    with app.app_context():
+        try:
+            print("🔄 Starting rating aggregate migration...")
+
+            inspector = db.inspect(db.engine)
+            for table in ('hotel', 'vehicle_rental'):
+                columns = [column['name'] for column in inspector.get_columns(table)]
+                if 'rating_sum' not in columns:
+                    print(f"📝 Adding rating_sum column to {table} table...")
+                    with db.engine.begin() as connection:
+                        connection.execute(text(f'ALTER TABLE {table} ADD COLUMN rating_sum INTEGER DEFAULT 0'))
+                    print("✅ rating_sum column added successfully")
+                else:
+                    print(f"✅ rating_sum column already exists on {table}")
+
+            changed = repair_rating_aggregates()
+            db.session.commit()
+            print(f"🎉 Repaired rating aggregates for {changed} hotels and rental companies")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+    return True
+
+if __name__ == "__main__":
+    success = migrate_rating_aggregates()
+    if success:
+        print("\n✅ Migration completed successfully!")
+    else:
+        print("\n❌ Migration failed!")
+        sys.exit(1)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Migration script to sync RoomAvailability rows with existing bookings
+so the calendar can be used as the source of truth for room-type bookings
+"""
+
+import sys
+import os
+from datetime import timedelta
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, RoomType, RoomAvailability
+from inventory import RoomInventory
+
+def migrate_room_availability():
+    """Recompute available_rooms/booked_rooms for every calendar row from live bookings"""
+    with app.app_context():
+        try:
+            print("🔄 Starting room availability migration...")
+
+            # Fresh inventory so ledgers are built straight from the Booking table
+            inventory = RoomInventory(ttl_seconds=0)
+            room_types = RoomType.query.all()
+            print(f"📊 Found {len(room_types)} room types")
+
+            updated_count = 0
+            for room_type in room_types:
+                rows = RoomAvailability.query.filter_by(room_type_id=room_type.id).all()
+                if not rows:
+                    continue
+
+                start = min(row.date for row in rows)
+                end = max(row.date for row in rows)
+                booked_by_night = dict(inventory.nightly_booked('room_type', room_type.id, start, end + timedelta(days=1)))
+                total_rooms = room_type.total_rooms or 0
+
+                for row in rows:
+                    booked = booked_by_night.get(row.date, 0)
+                    available = max(0, total_rooms - booked)
+                    if row.booked_rooms != booked or row.available_rooms != available:
+                        row.booked_rooms = booked
+                        row.available_rooms = available
+                        updated_count += 1
+
+            db.session.commit()
+            print(f"✅ Updated {updated_count} calendar rows")
+            print("🎉 Room availability migration completed successfully!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error during migration: {str(e)}")
+            return False
+
+    return True
+
+if __name__ == "__main__":
+    success = migrate_room_availability()
+    if success:
+        print("\n✅ Migration completed successfully!")
+    else:
+        print("\n❌ Migration failed!")
+        sys.exit(1)
@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import inspect
 from datetime import datetime
+import json
 
 db = SQLAlchemy()
 
@@ -24,6 +26,46 @@ class User(UserMixin, db.Model):
     vehicle_bookings = db.relationship('VehicleBooking', backref='user', lazy=True)
     vehicle_rentals = db.relationship('VehicleRental', backref='owner', lazy=True)
 
+class Amenity(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)  # e.g., "WiFi", "Pool", "GPS"
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Association tables linking hotels, room types and vehicles to amenities/features.
+# The primary key serves lookups by owner; the reverse index serves amenity filters.
+hotel_amenity = db.Table(
+    'hotel_amenity',
+    db.Column('hotel_id', db.Integer, db.ForeignKey('hotel.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('amenity_id', db.Integer, db.ForeignKey('amenity.id'), primary_key=True),
+    db.Index('ix_hotel_amenity_amenity_hotel', 'amenity_id', 'hotel_id')
+)
+
+room_type_amenity = db.Table(
+    'room_type_amenity',
+    db.Column('room_type_id', db.Integer, db.ForeignKey('room_type.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('amenity_id', db.Integer, db.ForeignKey('amenity.id'), primary_key=True),
+    db.Index('ix_room_type_amenity_amenity_room_type', 'amenity_id', 'room_type_id')
+)
+
+vehicle_feature = db.Table(
+    'vehicle_feature',
+    db.Column('vehicle_id', db.Integer, db.ForeignKey('vehicle.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('amenity_id', db.Integer, db.ForeignKey('amenity.id'), primary_key=True),
+    db.Index('ix_vehicle_feature_amenity_vehicle', 'amenity_id', 'vehicle_id')
+)
+
+def _names(items, fallback):
+    """Sorted amenity names from the association rows, or the legacy JSON column before backfill"""
+    if items:
+        return sorted(item.name for item in items)
+    if not fallback:
+        return []
+    try:
+        names = json.loads(fallback)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return names if isinstance(names, list) else []
+
 class Hotel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -38,6 +80,7 @@ class Hotel(db.Model):
     category = db.Column(db.String(50), default='Standard')  # Budget, Standard, Deluxe, Luxury, Resort, Boutique
     rating = db.Column(db.Float, default=0.0)  # User-generated rating (0-5)
     total_reviews = db.Column(db.Integer, default=0)  # Number of user reviews
+    rating_sum = db.Column(db.Integer, default=0)  # Sum of verified review ratings, kept with total_reviews
     amenities = db.Column(db.Text, nullable=True)  # JSON string
     images = db.Column(db.Text, nullable=True)  # JSON string of image URLs
     price_per_night = db.Column(db.Float, nullable=False)
@@ -50,6 +93,14 @@ class Hotel(db.Model):
     # Relationships
     bookings = db.relationship('Booking', backref='hotel', lazy=True)
     room_types = db.relationship('RoomType', backref='hotel', lazy=True, cascade='all, delete-orphan')
+    amenity_items = db.relationship('Amenity', secondary=hotel_amenity, lazy='select')
+    
+    @property
+    def amenity_names(self):
+        return _names(self.amenity_items, self.amenities)
+    
+    # Listing pages filter approved hotels by city
+    __table_args__ = (db.Index('ix_hotel_approved_city', 'is_approved', 'city'),)
 
 class RoomType(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -67,6 +118,11 @@ class RoomType(db.Model):
     # Relationships
     bookings = db.relationship('Booking', backref='room_type', lazy=True)
     availability = db.relationship('RoomAvailability', backref='room_type', lazy=True, cascade='all, delete-orphan')
+    amenity_items = db.relationship('Amenity', secondary=room_type_amenity, lazy='select')
+    
+    @property
+    def amenity_names(self):
+        return _names(self.amenity_items, self.amenities)
 
 class RoomAvailability(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -94,6 +150,14 @@ class Booking(db.Model):
     special_requests = db.Column(db.Text, nullable=True)
     booking_reference = db.Column(db.String(20), unique=True, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Overlap checks read (check_in, check_out, rooms) for live bookings of a hotel or room type;
+    # including rooms makes these indexes covering for the inventory ledger queries
+    __table_args__ = (
+        db.Index('ix_booking_hotel_status_dates', 'hotel_id', 'status', 'check_in', 'check_out', 'rooms'),
+        db.Index('ix_booking_room_type_status_dates', 'room_type_id', 'status', 'check_in', 'check_out', 'rooms'),
+        db.Index('ix_booking_user_created', 'user_id', 'created_at'),
+    )
 
 class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -110,6 +174,9 @@ class Review(db.Model):
     user = db.relationship('User', backref='reviews')
     hotel = db.relationship('Hotel', backref='reviews')
     booking = db.relationship('Booking', backref='review')
+    
+    # Hotel pages list verified reviews newest first (ids grow with created_at)
+    __table_args__ = (db.Index('ix_review_hotel_verified_id', 'hotel_id', 'is_verified', 'id'),)
 
 class Wishlist(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -148,6 +215,7 @@ class VehicleRental(db.Model):
     profile_picture = db.Column(db.String(200), nullable=True)  # Company profile picture
     rating = db.Column(db.Float, default=0.0)  # User-generated rating (0-5)
     total_reviews = db.Column(db.Integer, default=0)  # Number of user reviews
+    rating_sum = db.Column(db.Integer, default=0)  # Sum of verified review ratings, kept with total_reviews
     amenities = db.Column(db.Text, nullable=True)  # JSON string
     images = db.Column(db.Text, nullable=True)  # JSON string of image URLs
     is_approved = db.Column(db.Boolean, default=False)
@@ -181,6 +249,11 @@ class Vehicle(db.Model):
     
     # Relationships
     bookings = db.relationship('VehicleBooking', backref='vehicle', lazy=True)
+    feature_items = db.relationship('Amenity', secondary=vehicle_feature, lazy='select')
+    
+    @property
+    def feature_names(self):
+        return _names(self.feature_items, self.features)
 
 class VehicleBooking(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -201,6 +274,13 @@ class VehicleBooking(db.Model):
     special_requests = db.Column(db.Text, nullable=True)
     booking_reference = db.Column(db.String(20), unique=True, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Fleet availability reads live bookings of a vehicle by date range; dashboards list by owner/company
+    __table_args__ = (
+        db.Index('ix_vehicle_booking_vehicle_status_dates', 'vehicle_id', 'status', 'pickup_date', 'return_date'),
+        db.Index('ix_vehicle_booking_company_created', 'rental_company_id', 'created_at'),
+        db.Index('ix_vehicle_booking_user_created', 'user_id', 'created_at'),
+    )
 
 class VehicleReview(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -236,3 +316,14 @@ class Complaint(db.Model):
     
     # No user_id - completely anonymous
 
+
+def missing_indexes(engine):
+    """Return the names of declared indexes that do not exist in the database yet"""
+    inspector = inspect(engine)
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        missing.extend(index.name for index in table.indexes if index.name not in existing)
+    return missing
@@ -0,0 +1,109 @@
+# Keyset Pagination Helpers for TourismHub
+# This module encodes listing cursors, builds keyset WHERE clauses and streams
+# long result sets as a JSON array so listings never load the whole catalogue
+
+import base64
+import json
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import tuple_
+
+# Default and maximum page sizes for listing pages and their JSON equivalents
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+# Most rows a single stream=1 response may contain
+MAX_STREAM_ROWS = 10000
+
+
+def encode_cursor(key) -> str:
+    """Encode a sort key as an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: Optional[str]):
+    """Decode a cursor produced by encode_cursor(), or None if it is invalid"""
+    if not cursor:
+        return None
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')))
+    except (ValueError, TypeError):
+        return None
+
+
+def page_size(value: Optional[int]) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    if not value:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(MAX_PAGE_SIZE, value))
+
+
+def keyset_page(query, sort_expression, id_column, descending: bool, cursor: Optional[str], limit: int):
+    """Fetch one page of `query` ordered by (sort_expression, id_column).
+
+    The cursor holds the (sort value, id) of the last row of the previous
+    page, so each page is a range seek on the sort index instead of an
+    OFFSET scan. Rows must be ORM entities or rows whose last element is
+    the sort value. Returns (rows, next_cursor).
+    """
+    key = tuple_(sort_expression, id_column)
+    after = decode_cursor(cursor)
+    if after is not None and len(after) == 2:
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    if descending:
+        query = query.order_by(sort_expression.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_expression.asc(), id_column.asc())
+
+    rows = query.add_columns(sort_expression).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last_entity, last_value = rows[-1][0], rows[-1][-1]
+        next_cursor = encode_cursor((last_value, last_entity.id))
+    return [row[0] for row in rows], next_cursor
+
+
+def id_page(query, id_column, cursor: Optional[str], limit: int, descending: bool = True):
+    """Fetch one page of `query` ordered by id alone.
+
+    Used for newest-first lists, where ids grow with created_at, so the
+    cursor is just the last id seen. Returns (rows, next_cursor).
+    """
+    after = decode_cursor(cursor)
+    if after is not None and len(after) == 1:
+        query = query.filter(id_column < after[0] if descending else id_column > after[0])
+    query = query.order_by(id_column.desc() if descending else id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor((rows[-1].id,)) if has_more and rows else None
+    return rows, next_cursor
+
+
+def stream_json_array(key: str, fetch_page: Callable[[Optional[str]], tuple],
+                      serialize: Callable, header: Optional[dict] = None,
+                      max_rows: int = MAX_STREAM_ROWS) -> Iterable[str]:
+    """Yield a JSON object whose `key` array is filled page by page.
+
+    `fetch_page(cursor)` returns (items, next_cursor); pages are fetched
+    until next_cursor is None, so memory stays bounded by one page. The
+    stream also ends on an empty page, a cursor that does not advance or
+    after max_rows items, so a cursor bug cannot make it endless.
+    """
+    opening = dict(header or {})
+    yield json.dumps(opening)[:-1] + (', ' if opening else '') + json.dumps(key) + ': ['
+    cursor = None
+    sent = 0
+    while sent < max_rows:
+        items, next_cursor = fetch_page(cursor)
+        for item in items[:max_rows - sent]:
+            yield ('' if not sent else ', ') + json.dumps(serialize(item))
+            sent += 1
+        if not items or not next_cursor or next_cursor == cursor:
+            break
+        cursor = next_cursor
+    yield ']}'
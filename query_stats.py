@@ -0,0 +1,150 @@
+# SQL Query Instrumentation for TourismHub
+# This module counts and times every SQL statement issued while serving a Flask
+# request, logs slow statements with the route that ran them and keeps per-route
+# aggregates so N+1 regressions show up as a jump in queries per request
+
+import os
+import threading
+import time
+from collections import deque
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Statements slower than this (milliseconds) are logged; override with app.config['SLOW_QUERY_MS']
+DEFAULT_SLOW_QUERY_MS = 100
+
+# How many recent slow statements are kept for the stats endpoint
+SLOW_QUERY_HISTORY = 50
+
+# Longest statement text kept in logs and history
+STATEMENT_PREVIEW_CHARS = 500
+
+
+def _route_name() -> str:
+    """The URL rule of the current request, falling back to its path"""
+    if request.url_rule is not None:
+        return f'{request.method} {request.url_rule.rule}'
+    return f'{request.method} {request.path}'
+
+
+class QueryStats:
+    """Per-request query counter and per-route aggregates for one worker process.
+
+    Every Gunicorn worker keeps its own figures, so the stats endpoint
+    reports the worker that served it.
+    """
+
+    def __init__(self):
+        self.slow_query_ms = DEFAULT_SLOW_QUERY_MS
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._slow_queries = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._started_at = time.time()
+
+    def init_app(self, app):
+        """Hook the SQLAlchemy engine events and the request lifecycle"""
+        self.slow_query_ms = float(app.config.get('SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS))
+
+        # Listening on the Engine class covers the engine Flask-SQLAlchemy creates lazily
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._add_headers)
+        app.teardown_request(self._finish_request)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_times', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start_times = conn.info.get('query_start_times')
+        if not start_times:
+            return
+        elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+        if not has_request_context() or 'query_count' not in g:
+            return
+
+        g.query_count += 1
+        g.query_time_ms += elapsed_ms
+        if elapsed_ms >= self.slow_query_ms:
+            g.slow_query_count += 1
+            route = _route_name()
+            preview = ' '.join(statement.split())[:STATEMENT_PREVIEW_CHARS]
+            print(f"Slow query ({elapsed_ms:.1f} ms) on {route}: {preview}")
+            with self._lock:
+                self._slow_queries.append({
+                    'route': route,
+                    'duration_ms': round(elapsed_ms, 2),
+                    'statement': preview,
+                    'at': time.time()
+                })
+
+    def _start_request(self):
+        g.query_count = 0
+        g.query_time_ms = 0.0
+        g.slow_query_count = 0
+
+    def _add_headers(self, response):
+        if 'query_count' in g:
+            response.headers['X-Query-Count'] = str(g.query_count)
+            response.headers['X-Query-Time-Ms'] = f'{g.query_time_ms:.1f}'
+        return response
+
+    def _finish_request(self, exc):
+        if 'query_count' not in g:
+            return
+        route = _route_name()
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    'requests': 0,
+                    'queries': 0,
+                    'query_time_ms': 0.0,
+                    'max_queries': 0,
+                    'max_query_time_ms': 0.0,
+                    'slow_queries': 0
+                }
+            stats['requests'] += 1
+            stats['queries'] += g.query_count
+            stats['query_time_ms'] += g.query_time_ms
+            stats['max_queries'] = max(stats['max_queries'], g.query_count)
+            stats['max_query_time_ms'] = max(stats['max_query_time_ms'], g.query_time_ms)
+            stats['slow_queries'] += g.slow_query_count
+
+    def snapshot(self) -> dict:
+        """Per-route aggregates (most queries per request first) and recent slow statements"""
+        with self._lock:
+            routes = []
+            for route, stats in self._routes.items():
+                routes.append({
+                    'route': route,
+                    'requests': stats['requests'],
+                    'queries': stats['queries'],
+                    'avg_queries': round(stats['queries'] / stats['requests'], 2),
+                    'max_queries': stats['max_queries'],
+                    'avg_query_time_ms': round(stats['query_time_ms'] / stats['requests'], 2),
+                    'max_query_time_ms': round(stats['max_query_time_ms'], 2),
+                    'slow_queries': stats['slow_queries']
+                })
+            slow_queries = list(reversed(self._slow_queries))
+
+        routes.sort(key=lambda item: item['avg_queries'], reverse=True)
+        return {
+            'pid': os.getpid(),
+            'since': self._started_at,
+            'slow_query_ms': self.slow_query_ms,
+            'routes': routes,
+            'slow_queries': slow_queries
+        }
+
+    def reset(self):
+        """Forget all aggregates collected by this process"""
+        with self._lock:
+            self._routes.clear()
+            self._slow_queries.clear()
+            self._started_at = time.time()
+
+
+query_stats = QueryStats()
@@ -0,0 +1,88 @@
+# Rating Aggregates for TourismHub
+# This module keeps Hotel/VehicleRental ratings as running sums and counts that are
+# updated in the review's transaction, instead of re-averaging every review each time
+
+from sqlalchemy import case, func, update
+
+from models import db, Hotel, Review, VehicleRental, VehicleReview
+
+# Review model -> (rated model, foreign key column on the review)
+REVIEW_TARGETS = {
+    Review: (Hotel, 'hotel_id'),
+    VehicleReview: (VehicleRental, 'rental_company_id')
+}
+
+
+def _apply(review, sign: int):
+    """Add (sign=1) or remove (sign=-1) one review from its target's aggregates.
+
+    A single UPDATE computes the new sum, count and average from the stored
+    columns, so concurrent reviews from other workers cannot be lost.
+    """
+    target, foreign_key = REVIEW_TARGETS[type(review)]
+    new_sum = func.coalesce(target.rating_sum, 0) + sign * review.rating
+    new_count = func.coalesce(target.total_reviews, 0) + sign
+    db.session.execute(
+        update(target)
+        .where(target.id == getattr(review, foreign_key))
+        .values(
+            rating_sum=new_sum,
+            total_reviews=new_count,
+            rating=case((new_count > 0, func.round(new_sum * 1.0 / new_count, 1)), else_=0.0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def review_added(review):
+    """Count a newly added review; the caller commits"""
+    if review.is_verified:
+        _apply(review, 1)
+
+
+def repair_rating_aggregates() -> int:
+    """Recompute every rating aggregate from the review tables.
+
+    Uses one GROUP BY per review table and one bulk update per target table.
+    Returns the number of hotels and rental companies whose figures changed.
+    """
+    changed = 0
+    for review_model, (target, foreign_key) in REVIEW_TARGETS.items():
+        owner = getattr(review_model, foreign_key)
+        totals = {
+            target_id: (int(rating_sum or 0), count)
+            for target_id, rating_sum, count in db.session.query(
+                owner, func.sum(review_model.rating), func.count(review_model.id)
+            ).filter(review_model.is_verified == True).group_by(owner)
+        }
+
+        mappings = []
+        for target_id, rating_sum, count, rating in db.session.query(
+            target.id, target.rating_sum, target.total_reviews, target.rating
+        ):
+            new_sum, new_count = totals.get(target_id, (0, 0))
+            new_rating = round(new_sum / new_count, 1) if new_count else 0.0
+            if (rating_sum, count, rating) != (new_sum, new_count, new_rating):
+                mappings.append({
+                    'id': target_id,
+                    'rating_sum': new_sum,
+                    'total_reviews': new_count,
+                    'rating': new_rating
+                })
+
+        if mappings:
+            db.session.bulk_update_mappings(target, mappings)
+        changed += len(mappings)
+    return changed
+
+
+def rating_histogram(review_model, target_id: int) -> dict:
+    """Verified review counts per star (5..1) for one hotel or rental company"""
+    _, foreign_key = REVIEW_TARGETS[review_model]
+    counts = dict(
+        db.session.query(review_model.rating, func.count(review_model.id))
+        .filter(getattr(review_model, foreign_key) == target_id, review_model.is_verified == True)
+        .group_by(review_model.rating)
+        .all()
+    )
+    return {stars: counts.get(stars, 0) for stars in range(5, 0, -1)}
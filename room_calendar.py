@@ -0,0 +1,137 @@
+# Room Calendar Service for TourismHub
+# This module creates, extends and resizes RoomAvailability rows with set-based
+# statements instead of adding one ORM object per room type per night
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Booking, RoomType, RoomAvailability
+
+# Number of nights kept open for booking ahead of today
+CALENDAR_HORIZON_DAYS = 365
+
+
+def insert_ignoring_existing(rows) -> None:
+    """Bulk insert calendar rows, skipping nights another request created first"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        module = sqlite if dialect == 'sqlite' else postgresql
+        db.session.execute(module.insert(RoomAvailability).on_conflict_do_nothing(index_elements=['room_type_id', 'date']), rows)
+    elif dialect in ('mysql', 'mariadb'):
+        db.session.execute(mysql.insert(RoomAvailability).prefix_with('IGNORE'), rows)
+    else:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(RoomAvailability), rows)
+        except IntegrityError:
+            # Lost the race for some nights; the rows that exist now are used as they are
+            pass
+
+
+def insert_nights(room_type, nights: Iterable[date], booked_by_night: Optional[Dict[date, int]] = None,
+                  skip_existing: bool = False) -> int:
+    """Bulk insert calendar rows for the given nights in one executemany.
+
+    With skip_existing, nights that already have a row (for example one a
+    concurrent request just inserted) are left alone instead of raising.
+    """
+    booked_by_night = booked_by_night or {}
+    total_rooms = room_type.total_rooms or 0
+    rows = []
+    for night in nights:
+        booked = booked_by_night.get(night, 0)
+        rows.append({
+            'room_type_id': room_type.id,
+            'date': night,
+            'available_rooms': max(0, total_rooms - booked),
+            'booked_rooms': booked
+        })
+    if rows and skip_existing:
+        insert_ignoring_existing(rows)
+    elif rows:
+        db.session.execute(insert(RoomAvailability), rows)
+    return len(rows)
+
+
+def create_calendar(room_type, start: Optional[date] = None, days: int = CALENDAR_HORIZON_DAYS) -> int:
+    """Open `days` nights of availability for a new room type"""
+    start = start or date.today()
+    return insert_nights(room_type, (start + timedelta(days=i) for i in range(days)))
+
+
+def extend_horizon(today: Optional[date] = None, days: int = CALENDAR_HORIZON_DAYS) -> int:
+    """Create every missing night from today up to today + days for every active room type.
+
+    Meant to run daily. Besides appending past the current horizon this fills
+    gaps inside the range, found by comparing against the rows that exist.
+    Gap nights that already hold live bookings start with those rooms booked.
+    """
+    from inventory import LIVE_BOOKING_STATUSES, daily_counts
+
+    today = today or date.today()
+    horizon_end = today + timedelta(days=days)
+    window = [today + timedelta(days=i) for i in range(days)]
+
+    existing: Dict[int, set] = {}
+    for room_type_id, night in db.session.query(RoomAvailability.room_type_id, RoomAvailability.date).filter(
+        RoomAvailability.date >= today,
+        RoomAvailability.date < horizon_end
+    ):
+        existing.setdefault(room_type_id, set()).add(night)
+
+    room_types = RoomType.query.filter_by(is_active=True).all()
+    missing = {}
+    for room_type in room_types:
+        present = existing.get(room_type.id, set())
+        nights = [night for night in window if night not in present]
+        if nights:
+            missing[room_type.id] = nights
+    if not missing:
+        return 0
+
+    intervals = {room_type_id: [] for room_type_id in missing}
+    for row in db.session.query(Booking.room_type_id, Booking.check_in, Booking.check_out, Booking.rooms).filter(
+        Booking.room_type_id.in_(list(missing)),
+        Booking.status.in_(LIVE_BOOKING_STATUSES),
+        Booking.check_in < horizon_end,
+        Booking.check_out > today
+    ):
+        intervals[row.room_type_id].append((row.check_in, row.check_out, row.rooms))
+
+    added = 0
+    for room_type in room_types:
+        nights = missing.get(room_type.id)
+        if not nights:
+            continue
+        booked = daily_counts(intervals[room_type.id], today, days)
+        added += insert_nights(room_type, nights, {night: booked[(night - today).days] for night in nights},
+                               skip_existing=True)
+    return added
+
+
+def resize_calendar(room_type, total_rooms: int, from_date: Optional[date] = None) -> int:
+    """Recompute available_rooms for upcoming nights after total_rooms changes.
+
+    Returns the number of nights that are now overbooked (more rooms booked
+    than the new total), which the caller may want to report.
+    """
+    from_date = from_date or date.today()
+    remaining = total_rooms - RoomAvailability.booked_rooms
+    db.session.execute(
+        update(RoomAvailability)
+        .where(
+            RoomAvailability.room_type_id == room_type.id,
+            RoomAvailability.date >= from_date
+        )
+        .values(available_rooms=case((remaining > 0, remaining), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.query(func.count(RoomAvailability.id)).filter(
+        RoomAvailability.room_type_id == room_type.id,
+        RoomAvailability.date >= from_date,
+        RoomAvailability.booked_rooms > total_rooms
+    ).scalar()
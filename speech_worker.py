@@ -0,0 +1,101 @@
+# Speech Synthesis Worker for TourismHub
+# This module runs one long-lived asyncio event loop per process on a background
+# thread. Flask views submit Edge TTS jobs to it and get futures back, instead of
+# paying for asyncio.run() (a new loop per request). Blocking fallbacks such as
+# gTTS run on a small thread pool.
+
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Coroutine, Iterator
+
+# Edge TTS jobs allowed to run at once per process
+EDGE_TTS_CONCURRENCY = 8
+
+# Threads for blocking synthesis (gTTS) per process
+BLOCKING_WORKERS = 4
+
+
+class SpeechWorker:
+    """Event-loop thread with bounded concurrency plus a thread pool, started lazily per process"""
+
+    def __init__(self, max_concurrency: int = EDGE_TTS_CONCURRENCY, blocking_workers: int = BLOCKING_WORKERS):
+        self.max_concurrency = max_concurrency
+        self.blocking_workers = blocking_workers
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._semaphore = None
+        self._executor = None
+
+    def _ensure_started(self):
+        # Gunicorn forks workers after import, so each process starts its own loop on first use
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run_loop, name='speech-worker', daemon=True).start()
+            ready.wait()
+            self._loop = loop
+            self._executor = ThreadPoolExecutor(max_workers=self.blocking_workers, thread_name_prefix='speech-blocking')
+            self._pid = os.getpid()
+
+    async def _limited(self, coroutine: Coroutine):
+        async with self._semaphore:
+            return await coroutine
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """Schedule a coroutine on the loop; at most max_concurrency run at once"""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._limited(coroutine), self._loop)
+
+    def run_blocking(self, func: Callable, *args, **kwargs) -> Future:
+        """Run a blocking call on the thread pool"""
+        self._ensure_started()
+        return self._executor.submit(func, *args, **kwargs)
+
+    def stream(self, chunks: AsyncIterator[bytes], timeout: float) -> Iterator[bytes]:
+        """Iterate an async generator from sync code, item by item as the loop produces them.
+
+        Closing the returned iterator early (e.g. the client went away) cancels the job.
+        """
+        items = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for chunk in chunks:
+                    items.put(chunk)
+                items.put(done)
+            except Exception as e:
+                items.put(e)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f'No audio for {timeout} seconds')
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+
+speech_worker = SpeechWorker()
@@ -0,0 +1,89 @@
+"""
+Query-count budgets for the listing and dashboard routes.
+
+Each route is requested against a small seeded database and its
+X-Query-Count header is checked against a fixed budget, so an N+1 query
+(one extra SELECT per hotel, booking or vehicle) fails here instead of only
+showing up in benchmark_routes.py reports.
+
+    python -m pytest tests
+"""
+
+import os
+import random
+import sys
+import tempfile
+from argparse import Namespace
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Bind the app to a throwaway database before it is imported
+_handle, DATABASE_PATH = tempfile.mkstemp(prefix='tourismhub_test_', suffix='.db')
+os.close(_handle)
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+
+import app as app_module
+import models
+from app import app, db
+from benchmark_routes import seed_database, stub_external_services
+
+# Most SQL statements each route may issue, independent of how many rows are seeded
+QUERY_BUDGETS = {
+    '/hotels': 2,
+    '/vehicle-rentals': 6,
+    '/user/dashboard': 7,
+    '/manage-bookings': 4,
+    '/hotel/dashboard': 10,
+    '/vehicle-rental-dashboard': 7,
+}
+
+DATASET = Namespace(hotels=30, room_types=2, users=20, bookings=300, reviews=200, rentals=10, vehicles=3,
+                    vehicle_bookings=150, owner_share=5)
+
+
+@pytest.fixture(scope='module')
+def seeded():
+    stub_external_services(app_module)
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        ids = seed_database(db, vars(models), DATASET, random.Random(7))
+    yield ids
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    if os.path.exists(DATABASE_PATH):
+        os.remove(DATABASE_PATH)
+
+
+def client_for(user_id=None):
+    client = app.test_client()
+    if user_id is not None:
+        with client.session_transaction() as flask_session:
+            flask_session['_user_id'] = str(user_id)
+            flask_session['_fresh'] = True
+    return client
+
+
+def query_count(response):
+    assert response.status_code == 200, response.status_code
+    return int(response.headers['X-Query-Count'])
+
+
+@pytest.mark.parametrize('path, user_key', [
+    ('/hotels', None),
+    ('/vehicle-rentals', None),
+    ('/user/dashboard', 'traveller_id'),
+    ('/manage-bookings', 'traveller_id'),
+    ('/hotel/dashboard', 'hotel_owner_id'),
+    ('/vehicle-rental-dashboard', 'rental_owner_id'),
+])
+def test_route_stays_within_query_budget(seeded, path, user_key):
+    client = client_for(seeded[user_key] if user_key else None)
+    # The first request warms per-process caches such as the hotel search index
+    client.get(path)
+    assert query_count(client.get(path)) <= QUERY_BUDGETS[path]
@@ -0,0 +1,203 @@
+# Translation Cache for TourismHub
+# This module keeps translations in a two-tier cache: a per-process LRU in front
+# of a SQLite file shared by every Gunicorn worker, so repeated phrases and UI
+# strings skip the translator round-trip
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+# Per-user cache directory, kept out of the source tree
+CACHE_ROOT = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'tourismhub')
+
+# Shared store; set TRANSLATION_CACHE_PATH to put it elsewhere (all workers must use the same file)
+DEFAULT_CACHE_PATH = os.environ.get('TRANSLATION_CACHE_PATH') or os.path.join(CACHE_ROOT, 'translation_cache.db')
+
+# Translations are re-fetched after this long (seconds)
+TRANSLATION_TTL_SECONDS = 30 * 24 * 3600
+
+# Entries kept in each worker's memory
+MEMORY_CACHE_SIZE = 2048
+
+# Rows kept on disk; the least recently used rows are dropped beyond this
+DISK_CACHE_SIZE = 100000
+
+# Size is checked on disk every this many writes rather than on each one
+EVICTION_CHECK_INTERVAL = 200
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Collapse whitespace so "Where is  the station? " and "Where is the station?" share an entry"""
+    return ' '.join((text or '').split())
+
+
+def cache_key(text: str, source: str, target: str) -> str:
+    return hashlib.sha256(f'{source}\x1f{target}\x1f{text}'.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """In-process LRU backed by a SQLite table, both with a TTL"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: int = TRANSLATION_TTL_SECONDS,
+                 memory_size: int = MEMORY_CACHE_SIZE, disk_size: int = DISK_CACHE_SIZE):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()
+        self._local = threading.local()
+        self._writes = 0
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+                          'memory_evictions': 0, 'disk_evictions': 0, 'disk_errors': 0}
+
+    # Disk tier
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS translation ('
+                ' key TEXT PRIMARY KEY, source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,'
+                ' translated TEXT NOT NULL, created_at REAL NOT NULL, last_used_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_translation_last_used ON translation (last_used_at)')
+            self._local.connection = connection
+        return connection
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        row = self._connection().execute(
+            'SELECT translated, created_at FROM translation WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        translated, created_at = row
+        if now - created_at >= self.ttl_seconds:
+            self._connection().execute('DELETE FROM translation WHERE key = ?', (key,))
+            return None
+        self._connection().execute('UPDATE translation SET last_used_at = ? WHERE key = ?', (now, key))
+        return translated, created_at
+
+    def _disk_set(self, key: str, text: str, source: str, target: str, translated: str, now: float):
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO translation (key, source, target, text, translated, created_at, last_used_at)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, source, target, text, translated, now, now)
+        )
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self._evict_disk(now)
+
+    def _evict_disk(self, now: float):
+        """Drop expired rows, then the least recently used rows beyond disk_size"""
+        connection = self._connection()
+        expired = connection.execute('DELETE FROM translation WHERE created_at < ?', (now - self.ttl_seconds,)).rowcount
+        excess = connection.execute('SELECT COUNT(*) FROM translation').fetchone()[0] - self.disk_size
+        dropped = 0
+        if excess > 0:
+            dropped = connection.execute(
+                'DELETE FROM translation WHERE key IN ('
+                ' SELECT key FROM translation ORDER BY last_used_at LIMIT ?)', (excess,)
+            ).rowcount
+        with self._lock:
+            self._counters['disk_evictions'] += max(0, expired) + max(0, dropped)
+
+    # Memory tier
+
+    def _remember(self, key: str, translated: str, created_at: float):
+        with self._lock:
+            self._memory[key] = (translated, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+                self._counters['memory_evictions'] += 1
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    # Public API
+
+    def get(self, text: str, source: str, target: str) -> Optional[str]:
+        """Cached translation of `text`, or None on a miss"""
+        text = normalize_text(text)
+        key = cache_key(text, source, target)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                return entry[0]
+            if entry is not None:
+                del self._memory[key]
+
+        try:
+            entry = self._disk_get(key, now)
+        except sqlite3.Error as e:
+            print(f"Translation cache read failed: {e}")
+            self._count('disk_errors')
+            entry = None
+        if entry is not None:
+            self._remember(key, *entry)
+            self._count('disk_hits')
+            return entry[0]
+
+        self._count('misses')
+        return None
+
+    def set(self, text: str, source: str, target: str, translated: str):
+        """Store a translation in both tiers"""
+        text = normalize_text(text)
+        key = cache_key(text, source, target)
+        now = time.time()
+        self._remember(key, translated, now)
+        self._count('stores')
+        try:
+            self._disk_set(key, text, source, target, translated, now)
+        except sqlite3.Error as e:
+            print(f"Translation cache write failed: {e}")
+            self._count('disk_errors')
+
+    def get_or_translate(self, text: str, source: str, target: str, translate: Callable[[str], str]) -> str:
+        """Cached translation, calling translate(normalized_text) and storing its result on a miss"""
+        cached = self.get(text, source, target)
+        if cached is not None:
+            return cached
+        translated = translate(normalize_text(text)) or ''
+        if translated:
+            self.set(text, source, target, translated)
+        return translated
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this worker plus current tier sizes"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else None
+        try:
+            stats['disk_entries'] = self._connection().execute('SELECT COUNT(*) FROM translation').fetchone()[0]
+        except sqlite3.Error:
+            stats['disk_entries'] = None
+        return stats
+
+    def clear(self):
+        """Empty both tiers"""
+        with self._lock:
+            self._memory.clear()
+        self._connection().execute('DELETE FROM translation')
+
+
+translation_cache = TranslationCache()
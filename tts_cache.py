@@ -0,0 +1,131 @@
+# Speech Audio Cache for TourismHub
+# This module stores synthesized speech on disk under a hash of (text, voice,
+# rate, volume) so each phrase is synthesized once and then served as a file
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+# Per-user cache directory, kept out of the source tree
+CACHE_ROOT = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'tourismhub')
+
+# Directory holding the MP3 files, sharded by the first two hex digits of the key;
+# set TTS_CACHE_DIR to put it elsewhere (all workers must use the same directory)
+DEFAULT_AUDIO_DIR = os.environ.get('TTS_CACHE_DIR') or os.path.join(CACHE_ROOT, 'tts_cache')
+
+# Total size kept on disk; least recently written files are removed beyond this
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+# Disk usage is checked every this many stores rather than on each one
+PRUNE_CHECK_INTERVAL = 100
+
+
+def audio_key(text: str, voice: str, rate: str, volume: str) -> str:
+    """Content address of a clip; whitespace in the text is normalized first"""
+    normalized = ' '.join((text or '').split())
+    return hashlib.sha256(f'{voice}\x1f{rate}\x1f{volume}\x1f{normalized}'.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """Content-addressed MP3 files written atomically, shared by every worker"""
+
+    def __init__(self, directory: str = DEFAULT_AUDIO_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._counters = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.mp3')
+
+    def has(self, key: str) -> bool:
+        """Whether the clip is cached; counted as a hit or miss"""
+        found = os.path.exists(self.path(key))
+        with self._lock:
+            self._counters['hits' if found else 'misses'] += 1
+        return found
+
+    def open_writer(self, key: str):
+        """A temp file in the final directory; pass it to commit() or discard()"""
+        os.makedirs(os.path.dirname(self.path(key)), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path(key)), suffix='.part')
+        return os.fdopen(handle, 'wb'), temp_path
+
+    def commit(self, key: str, writer, temp_path: str):
+        """Close a writer and move its file into place; readers never see partial clips"""
+        writer.close()
+        if os.path.getsize(temp_path) == 0:
+            os.remove(temp_path)
+            return
+        os.replace(temp_path, self.path(key))
+        with self._lock:
+            self._counters['stores'] += 1
+            self._stores += 1
+            check = self._stores % PRUNE_CHECK_INTERVAL == 0
+        if check:
+            self.prune()
+
+    def discard(self, writer, temp_path: str):
+        writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    def store(self, key: str, audio: bytes):
+        """Write a complete clip"""
+        writer, temp_path = self.open_writer(key)
+        try:
+            writer.write(audio)
+        except Exception:
+            self.discard(writer, temp_path)
+            raise
+        self.commit(key, writer, temp_path)
+
+    def prune(self) -> int:
+        """Remove the oldest clips until the cache fits in max_bytes; returns files removed"""
+        files = []
+        total = 0
+        stale_before = time.time() - 3600
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                # Leftovers of interrupted writes
+                if name.endswith('.part'):
+                    if stat.st_mtime < stale_before:
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._counters['evictions'] += removed
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+        return stats
+
+
+audio_cache = AudioCache()